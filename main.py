@@ -4,31 +4,62 @@ vertex detection, image cleanup, SVG tracing, Blender script generation, and Typ
 
 Modules:
 - `blender`: Handles Blender script generation.
+- `blender.stub`: Handles offline verification of Blender batch scripts.
 - `clean.background`: Handles background cleaning.
 - `clean.crop`: Handles image cropping.
 - `config.config`: Handles configuration reading and logging.
 - `config.location`: Handles I/O path generation.
+- `distributed.worker`: Handles claiming and processing images from a shared directory.
 - `documentation.typst`: Handles Typst document generation.
+- `evaluation.benchmark`: Handles benchmarks of the processing steps.
+- `evaluation.vertices`: Handles accuracy-versus-speed evaluation of vertex detection.
+- `metrics.metrics`: Handles throughput metrics export.
+- `pipeline.pipeline`: Runs the per-image processing steps.
 - `postprocess.svg`: Handles SVG tracing.
 - `process.edge`: Handles edge detection and vertex extraction.
 - `process.merge`: Handles merging of close vertices.
+- `source.archive`: Handles zip and tar plan archives.
+- `source.pages`: Handles multi-page TIFF and PDF inputs.
+- `tune.tuner`: Handles interactive tuning of the threshold and thickness iterations.
 - `utility.save`: Handles saving of vertices to a text file.
+- `watch.watch`: Handles reprocessing of new or modified images.
+
+Commands:
+- `python main.py`: Processes the image named in `config.json`. Multi-page TIFF and PDF inputs are processed page by page, zip and tar archives member by member.
+- `python main.py archive`: Processes a zip or tar archive without extracting it. See `python main.py archive --help`.
+- `python main.py worker`: Processes every image of a (shared) input directory. See `python main.py worker --help`.
+- `python main.py watch`: Reprocesses new or modified images of an input directory. See `python main.py watch --help`.
+- `python main.py evaluate`: Scores vertex detection against ground truth. See `python main.py evaluate --help`.
+- `python main.py blender`: Generates one Blender script importing every processed plan. See `python main.py blender --help`.
+- `python main.py tune`: Tunes the threshold and thickness iterations with live previews. See `python main.py tune --help`.
+- `python main.py benchmark buffers|simplify`: Compares buffer reuse, or contour simplification per thread count. See `python main.py benchmark --help`.
+- `--metrics-dir DIR` / `--metrics-port PORT` (before the command): Export OpenMetrics files / serve them on a port.
 
 Functions:
 - `main()`: Orchestrates the overall workflow of the application.
+- `_parse_args() -> argparse.Namespace`: Parses the command line arguments.
 """
 
-import src.blender.blender as blender
-import src.clean.background
-import src.clean.crop
+import argparse
+import os
+import sys
+
+from loguru import logger
+
 import src.config.config as cfg
-import src.config.location as location
-import src.documentation.typst as typst
-import src.postprocess.svg
+import src.evaluation.vertices as evaluation
+from src.blender import blender, stub
+from src.check.probe import InputRejected
+from src.config import location
 from src.config.config import Config
 from src.config.location import IO
-from src.process import edge, merge
-from src.utility import save
+from src.distributed import worker
+from src.evaluation import benchmark
+from src.metrics import metrics
+from src.pipeline import pipeline
+from src.source import archive, pages
+from src.tune import tuner
+from src.watch import watch
 
 
 def main() -> None:
@@ -49,32 +80,150 @@ def main() -> None:
   11. Generates a Typst document.
 
   The version of the application is logged and used in the Typst document generation.
+  Steps 5-11 are run by `pipeline.run`. The `worker` and `watch` commands run them for every image of an input
+  directory instead.
   """
-  VERSION: str = "0.9.0"
+  args = _parse_args()
 
-  # Read `config.json` and generate I/O paths
+  # Read `config.json`
   config: Config = cfg.read_config()
   cfg.log_config(config)
+
+  # Metrics are exported by every process that runs the pipeline
+  if args.metrics_dir or args.metrics_port:
+    metrics.configure(args.metrics_dir or "output/.metrics")
+  if args.metrics_port:
+    metrics.serve(args.metrics_dir or "output/.metrics", args.metrics_port)
+
+  if args.command == "worker":
+    worker.run(config, args.workers, args.input_dir, args.output_dir, args.lease_seconds, args.poll_seconds)
+    return
+
+  if args.command == "watch":
+    watch.watch(config, args.input_dir, args.output_dir, args.workers, args.poll_seconds, args.settle_seconds)
+    return
+
+  if args.command == "evaluate":
+    configs = {os.path.splitext(os.path.basename(path))[0]: cfg.read_config(path) for path in args.config}
+    scores = evaluation.evaluate(args.corpus, configs or {"config": config}, args.tolerance, args.output_dir)
+    logger.info("Evaluation summary\n" + evaluation.summarize(scores))
+    return
+
+  if args.command == "blender":
+    plans = blender.generate_batch_bpy_script(args.output_dir, config, args.script, args.blend)
+    if args.verify:
+      collections = stub.verify(args.script)
+      missing = [name for name, _ in plans if len(collections.get(name, [])) != 1]
+      if missing:
+        logger.error(f"Batch script did not import {missing} into their own collection")
+        sys.exit(1)
+      else:
+        logger.info(f"Verified batch script offline: {len(plans)} plans imported into their own collection")
+    return
+
+  if args.command == "archive":
+    archive.run(config, args.archive, args.output_dir, args.output_archive)
+    return
+
+  if args.command == "tune":
+    path: str = args.image or location.generate_io_paths(config.filename).input
+    if args.replay:
+      tuner.replay(path, config, args.replay, args.output_dir)
+    else:
+      tuner.run(path, config)
+    return
+
+  if args.command == "benchmark":
+    if args.kind == "simplify":
+      scalings = benchmark.simplify(args.input_dir, config, tuple(args.threads))
+      logger.info("Benchmark summary\n" + benchmark.summarize_scaling(scalings))
+    else:
+      measurements = benchmark.buffers(args.input_dir, config, args.output_dir)
+      logger.info("Benchmark summary\n" + benchmark.summarize(measurements))
+    return
+
+  # Generate I/O paths
   io: IO = location.generate_io_paths(config.filename)
+  if archive.is_archive(io.input):
+    archive.run(config, io.input)
+    return
+  if pages.is_multipage(io.input):
+    pages.run(config)
+    return
   location.generate_output_folder(config.filename)
 
-  # Vertex detection
-  vertices = edge.detect(io, config)
-  merged_vertices = merge.close_vertices(io, vertices, epsilon=12)
-  save.vertices_as_txt(io.coordinates, merged_vertices)
+  # Detect, clean, trace and document
+  try:
+    pipeline.run(io, config, cfg.VERSION)
+  except InputRejected as error:
+    logger.error(str(error))
+
+
+def _parse_args() -> argparse.Namespace:
+  """
+  Parses the command line arguments.
+
+  Returns:
+      argparse.Namespace: The parsed arguments. `command` is None when no command is given.
+  """
+  parser = argparse.ArgumentParser(description="Digitize floorplan images.")
+  parser.add_argument("--metrics-dir", help="Export OpenMetrics files (one per process) to this directory.")
+  parser.add_argument("--metrics-port", type=int, help="Serve merged metrics on http://localhost:PORT/metrics.")
+  commands = parser.add_subparsers(dest="command")
+
+  worker_parser = commands.add_parser("worker", help="Claim and process images from a shared input directory.")
+  worker_parser.add_argument("--workers", type=int, default=1, help="Number of local worker processes.")
+  worker_parser.add_argument("--input-dir", default="input", help="Shared directory containing input images.")
+  worker_parser.add_argument("--output-dir", default="output", help="Shared root directory of the outputs.")
+  worker_parser.add_argument("--lease-seconds", type=float, default=120, help="Heartbeat timeout of a claim.")
+  worker_parser.add_argument("--poll-seconds", type=float, default=2, help="Wait while other workers hold images.")
+
+  watch_parser = commands.add_parser("watch", help="Reprocess new or modified images of an input directory.")
+  watch_parser.add_argument("--workers", type=int, default=2, help="Maximum number of images processed at once.")
+  watch_parser.add_argument("--input-dir", default="input", help="Directory to watch.")
+  watch_parser.add_argument("--output-dir", default="output", help="Root directory of the outputs.")
+  watch_parser.add_argument("--poll-seconds", type=float, default=1, help="Seconds between directory scans.")
+  watch_parser.add_argument("--settle-seconds", type=float, default=2, help="Seconds a file must stay unchanged.")
+
+  evaluate_parser = commands.add_parser("evaluate", help="Score vertex detection against ground-truth vertex files.")
+  evaluate_parser.add_argument("--corpus", required=True, help="Directory of images with `<base>.txt` ground truth.")
+  evaluate_parser.add_argument(
+    "--config", action="append", default=[], help="Configuration file to compare (repeatable). Defaults to config.json."
+  )
+  evaluate_parser.add_argument("--tolerance", type=float, default=5, help="Maximum distance of a match in pixels.")
+  evaluate_parser.add_argument("--output-dir", default="output/.evaluation", help="Root directory of the overlays.")
+
+  blender_parser = commands.add_parser("blender", help="Generate one Blender script importing every processed plan.")
+  blender_parser.add_argument("--output-dir", default="output", help="Root directory of the processed plans.")
+  blender_parser.add_argument("--script", default="output/blender-batch.py", help="Path of the batch script.")
+  blender_parser.add_argument("--blend", help="Save the imported plans to this .blend file.")
+  blender_parser.add_argument("--verify", action="store_true", help="Run the script against a stand-in `bpy` module.")
 
-  # Cleanup
-  src.clean.background.run(io, config)
-  src.clean.crop.padding(io)
+  archive_parser = commands.add_parser("archive", help="Process a zip or tar archive of images without extracting it.")
+  archive_parser.add_argument(
+    "archive", help="Path to the zip or tar (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz) archive."
+  )
+  archive_parser.add_argument("--output-dir", default="output", help="Root directory of the outputs.")
+  archive_parser.add_argument("--output-archive", help="Pack the outputs into this zip or tar archive instead.")
 
-  # Trace as SVG and generate Blender action script
-  src.postprocess.svg.trace(io, config)
+  tune_parser = commands.add_parser("tune", help="Tune the threshold and thickness iterations with live previews.")
+  tune_parser.add_argument("--image", help="Image to tune on. Defaults to the image named in `config.json`.")
+  tune_parser.add_argument("--replay", help="Replay a parameter script without windows, saving every preview.")
+  tune_parser.add_argument("--output-dir", default="output/.tune", help="Directory of the replayed previews.")
 
-  # Generate Blender action script
-  blender.generate_bpy_script(io, config)
+  benchmark_parser = commands.add_parser("benchmark", help="Benchmark the processing steps on a directory of images.")
+  benchmark_parser.add_argument(
+    "kind",
+    choices=["buffers", "simplify"],
+    help="`buffers`: allocations with and without reuse. `simplify`: contour simplification per thread count.",
+  )
+  benchmark_parser.add_argument("--input-dir", default="input", help="Directory containing the images.")
+  benchmark_parser.add_argument("--output-dir", default="output/.benchmark", help="Root directory of the outputs.")
+  benchmark_parser.add_argument(
+    "--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="`simplify`: thread counts to compare."
+  )
 
-  # Generate Typst document
-  typst.generate_typst_document(io, config, VERSION)
+  return parser.parse_args()
 
 
 if __name__ == "__main__":
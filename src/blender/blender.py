@@ -1,21 +1,23 @@
 """
 This module provides functionality to generate a Blender Python script (.bpy) from a template.
 It replaces placeholders in the template with specific values and saves the resulting script to a specified location.
+It also generates a batch script that imports many processed plans in a single Blender session.
 
 Dependencies:
 - `os`: Standard library for interacting with the operating system.
 - `loguru.logger`: For logging information.
-- `src.config.location.IO`: Custom class for input/output paths.
+- `src.config.location`: Custom module for input/output paths.
 - `src.config.config.Config`: Custom class for configuration settings.
 """
 
 import os
 from loguru import logger
+from src.config import location
 from src.config.location import IO
 from src.config.config import Config
 
 
-def generate_bpy_script(io: IO, config: Config) -> None:
+def generate_bpy_script(io: IO, config: Config, svg_path: str | None = None) -> None:
   """
   Generates a Blender Python script by replacing placeholders in a template with actual values
   and saves the script to a specified location.
@@ -23,6 +25,8 @@ def generate_bpy_script(io: IO, config: Config) -> None:
   Args:
       io (IO): An instance of the IO class containing input/output paths.
       config (Config): An instance of the Config class containing configuration settings.
+      svg_path (str | None, optional): The SVG path to embed in the script. Defaults to `io.svg`.
+          Used when outputs are staged before being published to their final location.
 
   Process:
       1. Calls `_generate_full_svg_path(io)` to get the absolute path of the SVG file.
@@ -32,7 +36,7 @@ def generate_bpy_script(io: IO, config: Config) -> None:
       4. Saves the modified template to the specified location using `_save_bpy_script(io, template)`.
       5. Logs an info message indicating the location where the script has been saved.
   """
-  full_svg_path: str = _generate_full_svg_path(io)
+  full_svg_path: str = os.path.abspath(svg_path) if svg_path else _generate_full_svg_path(io)
   template: str = _read_blender_script_template()
   template = (
     template.replace("#SVG-PATH-PLACEHOLDER#", full_svg_path)
@@ -43,6 +47,67 @@ def generate_bpy_script(io: IO, config: Config) -> None:
   logger.info(f"Saved Blender action script in `{io.blender_script}`")
 
 
+def generate_batch_bpy_script(
+  output_dir: str, config: Config, path: str, blend_path: str | None = None, timings_path: str | None = None
+) -> list[tuple[str, str]]:
+  """
+  Generates a Blender Python script that imports every processed plan of an output directory in a single Blender
+  session, each into its own collection, and saves it to a specified location.
+
+  Args:
+      output_dir (str): The root directory of the outputs.
+      config (Config): An instance of the Config class containing configuration settings.
+      path (str): The path of the batch script.
+      blend_path (str | None, optional): The .blend file saved after importing every plan. Defaults to None (not saved).
+      timings_path (str | None, optional): The JSON file receiving the import time of every plan, in seconds.
+          Defaults to `<path>.timings.json`.
+
+  Process:
+      1. Finds the plans with a traced SVG file using `find_plans(output_dir)`.
+      2. Reads the batch script template and replaces its placeholders with Python literals.
+      3. Saves the script and logs its location.
+
+  Returns:
+      list[tuple[str, str]]: The name and absolute SVG path of every plan in the script.
+  """
+  plans: list[tuple[str, str]] = find_plans(output_dir)
+  with open("src/blender/blender_batch_template.txt", "r") as file:
+    template: str = file.read()
+  template = (
+    template.replace("#PLANS-PLACEHOLDER#", repr(plans))
+    .replace("#SCALE-PLACEHOLDER#", str(config.scale))
+    .replace("#HEIGHT-PLACEHOLDER#", str(config.height))
+    .replace("#BLEND-PATH-PLACEHOLDER#", repr(os.path.abspath(blend_path) if blend_path else None))
+    .replace("#TIMINGS-PATH-PLACEHOLDER#", repr(os.path.abspath(timings_path or f"{path}.timings.json")))
+  )
+  with open(path, "w") as file:
+    file.write(template)
+  logger.info(f"Saved Blender batch script for {len(plans)} plans in `{path}`")
+  return plans
+
+
+def find_plans(output_dir: str) -> list[tuple[str, str]]:
+  """
+  Finds the processed plans of an output directory, including the pages of multi-page inputs.
+
+  Args:
+      output_dir (str): The root directory of the outputs.
+
+  Returns:
+      list[tuple[str, str]]: The name (relative folder, with `/` replaced by `-`) and absolute SVG path of every plan
+      with a traced SVG file, sorted by name. Hidden folders (queue, watch state, metrics) are skipped.
+  """
+  plans: list[tuple[str, str]] = []
+  for root, folders, _ in os.walk(output_dir):
+    folders[:] = sorted(folder for folder in folders if not folder.startswith("."))
+    for folder in folders:
+      svg: str = location.generate_io_paths(f"{folder}.png", output_dir=root).svg  # Only the base name is used
+      if os.path.isfile(svg):
+        name: str = os.path.relpath(os.path.join(root, folder), output_dir).replace(os.sep, "-")
+        plans.append((name, os.path.abspath(svg)))
+  return sorted(plans)
+
+
 def _generate_full_svg_path(io: IO) -> str:
   """
   Generates the absolute path of the SVG file.
@@ -0,0 +1,179 @@
+"""
+This module provides a minimal stand-in for Blender's `bpy` module, to run generated batch scripts offline.
+
+It models the parts of `bpy` used by the batch script: objects, collections, selection, joining curves and the SVG
+importer (one curve per `<path>` element, in a new collection named after the file, like Blender's importer).
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `runpy`: Standard library for running a script.
+- `sys`: Standard library for the module registry.
+- `types`: Standard library for creating the module.
+- `xml.etree.ElementTree`: Standard library for parsing the imported SVG files.
+
+Classes:
+- `Collection`: A collection of objects with child collections.
+- `Object`: A curve object with its data.
+
+Functions:
+- `create() -> types.ModuleType`: Creates a fresh `bpy` stand-in with an empty scene.
+- `verify(script: str) -> dict[str, list[Object]]`: Runs a batch script against the stand-in.
+"""
+
+import os
+import runpy
+import sys
+import types
+import xml.etree.ElementTree as ET
+
+
+class Collection:
+  """
+  A collection of objects with child collections.
+
+  Attributes:
+      name (str): The name of the collection.
+      objects (list[Object]): The objects linked to the collection, with `link` and `unlink` methods.
+      children (list[Collection]): The child collections, with a `link` method.
+  """
+
+  def __init__(self, name: str) -> None:
+    self.name = name
+    self.objects = _Links()
+    self.children = _Links()
+
+
+class Object:
+  """
+  A curve object with its data.
+
+  Attributes:
+      name (str): The name of the object.
+      type (str): The type of the object, always `CURVE`.
+      data (types.SimpleNamespace): The curve data (`splines`, `extrude`, `materials`).
+      scale (tuple[float, float, float]): The scale of the object.
+  """
+
+  def __init__(self, bpy: types.ModuleType, name: str, splines: int) -> None:
+    self._bpy = bpy
+    self.name = name
+    self.type = "CURVE"
+    self.data = types.SimpleNamespace(splines=splines, extrude=0.0, materials=["Material"])
+    self.scale = (1.0, 1.0, 1.0)
+    self.selected = False
+
+  def select_set(self, state: bool) -> None:
+    self.selected = state
+
+  @property
+  def users_collection(self) -> list[Collection]:
+    return [collection for collection in _all_collections(self._bpy) if self in collection.objects]
+
+
+class _Links(list):
+  """
+  A list with the `link`/`unlink` methods of Blender's collection properties.
+  """
+
+  def link(self, item) -> None:
+    self.append(item)
+
+  def unlink(self, item) -> None:
+    self.remove(item)
+
+
+def create() -> types.ModuleType:
+  """
+  Creates a fresh `bpy` stand-in with an empty scene (one default object, which the batch script deletes).
+
+  Returns:
+      types.ModuleType: The stand-in module.
+  """
+  bpy = types.ModuleType("bpy")
+  scene = types.SimpleNamespace(collection=Collection("Scene Collection"))
+  view_layer = types.SimpleNamespace(objects=types.SimpleNamespace(active=None))
+  bpy.context = types.SimpleNamespace(scene=scene, view_layer=view_layer)
+  bpy.saved = []  # Paths passed to `save_as_mainfile`
+
+  def remove(collection: Collection) -> None:
+    for parent in _all_collections(bpy):
+      if collection in parent.children:
+        parent.children.unlink(collection)
+
+  bpy.data = types.SimpleNamespace(objects=[], collections=types.SimpleNamespace(new=Collection, remove=remove))
+
+  def select_all(action: str) -> None:
+    for obj in bpy.data.objects:
+      obj.selected = action == "SELECT"
+
+  def delete() -> None:
+    for obj in [obj for obj in bpy.data.objects if obj.selected]:
+      _remove(bpy, obj)
+
+  def join() -> None:
+    active = view_layer.objects.active
+    for obj in [obj for obj in bpy.data.objects if obj.selected and obj is not active]:
+      active.data.splines += obj.data.splines
+      _remove(bpy, obj)
+
+  def svg(filepath: str) -> None:
+    paths = [element for element in ET.parse(filepath).iter() if element.tag.endswith("path")]
+    collection = Collection(os.path.basename(filepath))
+    scene.collection.children.link(collection)
+    for index, _ in enumerate(paths):
+      obj = Object(bpy, f"Curve.{index:03d}", splines=1)
+      bpy.data.objects.append(obj)
+      collection.objects.link(obj)
+
+  bpy.ops = types.SimpleNamespace(
+    object=types.SimpleNamespace(select_all=select_all, delete=delete, join=join),
+    import_curve=types.SimpleNamespace(svg=svg),
+    wm=types.SimpleNamespace(save_as_mainfile=lambda filepath: bpy.saved.append(filepath)),
+  )
+
+  default = Object(bpy, "Cube", splines=0)
+  bpy.data.objects.append(default)
+  scene.collection.objects.link(default)
+  return bpy
+
+
+def verify(script: str) -> dict[str, list[Object]]:
+  """
+  Runs a batch script against the stand-in.
+
+  Args:
+      script (str): The path to the batch script.
+
+  Returns:
+      dict[str, list[Object]]: The objects of every child collection of the scene, by collection name.
+  """
+  bpy = create()
+  previous = sys.modules.get("bpy")
+  sys.modules["bpy"] = bpy
+  try:
+    runpy.run_path(script, run_name="__main__")
+  finally:
+    if previous is None:
+      del sys.modules["bpy"]
+    else:
+      sys.modules["bpy"] = previous
+  return {collection.name: list(collection.objects) for collection in bpy.context.scene.collection.children}
+
+
+def _all_collections(bpy: types.ModuleType) -> list[Collection]:
+  """
+  Returns the scene collection and every collection below it.
+  """
+  collections: list[Collection] = [bpy.context.scene.collection]
+  for collection in collections:
+    collections += collection.children
+  return collections
+
+
+def _remove(bpy: types.ModuleType, obj: Object) -> None:
+  """
+  Removes an object from the scene and every collection.
+  """
+  for collection in obj.users_collection:
+    collection.objects.unlink(obj)
+  bpy.data.objects.remove(obj)
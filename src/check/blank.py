@@ -13,7 +13,7 @@ import numpy as np
 from src.config.location import IO
 
 
-def is_image_blank(io: IO) -> bool:
+def is_image_blank(io: IO, image: np.ndarray | None = None) -> bool:
   """
   Check if an image is blank after a cleanup process.
   This may happen due to the following reasons:
@@ -22,9 +22,11 @@ def is_image_blank(io: IO) -> bool:
 
   Args:
       io (IO): An instance of the IO class containing input/output paths.
+      image (np.ndarray | None, optional): The cleaned background image. Defaults to None (reads it from disk).
 
   Returns:
       bool: True if the image is blank, False otherwise.
   """
-  image = cv2.imread(io.clean_background, cv2.IMREAD_GRAYSCALE)
+  if image is None:
+    image = cv2.imread(io.clean_background, cv2.IMREAD_GRAYSCALE)
   return bool(np.all(image == np.max(image)))
@@ -0,0 +1,198 @@
+"""
+This module provides a fast pre-flight check that rejects unusable inputs before the pipeline does any work.
+It decodes a reduced-size grayscale thumbnail (JPEG decoders skip most of the work at reduced sizes), applies the
+configured threshold and a proportionally scaled thickness reduction, and predicts a blank or degenerate result.
+
+Dependencies:
+- `time`: Standard library for time access.
+- `dataclasses`: For the rejection record.
+- `cv2`: OpenCV library for image processing.
+- `numpy`: NumPy library for numerical operations.
+- `src.config.config.Config`: Custom class for configuration settings.
+
+Classes:
+- `Rejection`: A dataclass representing why an input was rejected.
+- `InputRejected`: An exception carrying a `Rejection`, raised instead of exiting the program.
+
+Functions:
+- `probe(path: str, config: Config, reduction: int = 4, data: np.ndarray | None = None, image: np.ndarray | None = None) -> Rejection | None`: Predicts whether an input is unusable.
+- `check(path: str, config: Config, data: np.ndarray | None = None, image: np.ndarray | None = None) -> None`: Raises `InputRejected` if an input is unusable.
+- `_thumbnail(image: np.ndarray, path: str, reduction: int) -> np.ndarray`: Downscales an already-decoded image like a reduced decode.
+- `_gray(image: np.ndarray, path: str) -> np.ndarray`: Converts an already-decoded image to grayscale like its decoder.
+"""
+
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from src.config.config import Config
+
+# Reasons of rejection
+UNREADABLE = "unreadable"
+UNIFORM = "uniform"
+BLANK = "blank"
+DEGENERATE = "degenerate"
+
+DEGENERATE_FRACTION = 0.9  # Share of dark pixels above which the threshold keeps (nearly) everything
+REDUCED_FLAGS = {
+  2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+  4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+  8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+# Grayscale conversion of the decoders, by extension | (B, G, R) weights, rounding offset, shift
+DECODER_GRAY: dict[str, tuple[tuple[int, int, int], int, int]] = {
+  ".png": ((3737, 19234, 9797), 0, 15),  # libpng `png_set_rgb_to_gray`, truncated
+  ".bmp": ((1868, 9617, 4899), 1 << 13, 14),  # OpenCV decoders, rounded
+  ".tif": ((1868, 9617, 4899), 1 << 13, 14),
+  ".tiff": ((1868, 9617, 4899), 1 << 13, 14),
+}
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+
+
+@dataclass(frozen=True, slots=True)
+class Rejection:
+  """
+  A dataclass to hold why an input was rejected.
+
+  Attributes:
+      path (str): The path to the input image.
+      reason (str): One of `UNREADABLE`, `UNIFORM`, `BLANK` or `DEGENERATE`.
+      message (str): A description of the problem and how to fix it.
+      seconds (float): The time spent deciding.
+  """
+
+  path: str
+  reason: str
+  message: str
+  seconds: float
+
+
+class InputRejected(Exception):
+  """
+  An exception carrying a `Rejection`, raised instead of exiting the program on unusable inputs.
+
+  Attributes:
+      rejection (Rejection): Why the input was rejected.
+  """
+
+  def __init__(self, rejection: Rejection) -> None:
+    super().__init__(rejection)
+    self.rejection = rejection
+
+  def __str__(self) -> str:
+    return f"Rejected `{self.rejection.path}` ({self.rejection.reason}): {self.rejection.message}"
+
+
+def probe(
+  path: str, config: Config, reduction: int = 4, data: np.ndarray | None = None, image: np.ndarray | None = None
+) -> Rejection | None:
+  """
+  Predicts whether an input is unusable from a reduced-size thumbnail.
+
+  Args:
+      path (str): The path to the input image.
+      config (Config): An instance of the Config class containing configuration settings.
+      reduction (int, optional): The downscale factor of the thumbnail, 2, 4 or 8. Defaults to 4.
+      data (np.ndarray | None, optional): The encoded image, if it is not a file (eg: an archive member). Defaults to
+          None (reads `path`).
+      image (np.ndarray | None, optional): The already-decoded image (eg: prefetched), downscaled instead of decoding
+          a thumbnail. Defaults to None.
+
+  Process:
+      1. Decodes a grayscale thumbnail. Rejects files that cannot be decoded.
+      2. Rejects images with a single shade (no content).
+      3. Applies the threshold. Rejects images with no dark pixel (blank) or almost only dark pixels (degenerate).
+      4. Reduces the thickness of walls with `iterations / reduction - 1` iterations, so that walls that survive at
+         full resolution also survive on the thumbnail. Rejects images where every wall vanishes (blank).
+
+  Returns:
+      Rejection | None: Why the input is unusable, or None if it looks usable.
+  """
+  start: float = time.perf_counter()
+
+  def reject(reason: str, message: str) -> Rejection:
+    return Rejection(path, reason, message, time.perf_counter() - start)
+
+  if image is not None:
+    thumbnail = _thumbnail(image, path, reduction)
+  elif data is not None:
+    thumbnail = cv2.imdecode(data, REDUCED_FLAGS[reduction])
+  else:
+    thumbnail = cv2.imread(path, REDUCED_FLAGS[reduction])
+  if thumbnail is None or thumbnail.size == 0:
+    return reject(UNREADABLE, "The file is missing or is not a supported image.")
+  if thumbnail.min() == thumbnail.max():
+    return reject(UNIFORM, "The image has a single shade, so there is nothing to digitize.")
+
+  # Convert image to binary | Walls are dark
+  _, binary = cv2.threshold(thumbnail, config.threshold_value, 255, cv2.THRESH_BINARY)
+  dark: float = 1 - cv2.countNonZero(binary) / binary.size
+  if dark == 0:
+    return reject(BLANK, f"No stroke is darker than threshold {config.threshold_value}. Increase the threshold.")
+  if dark > DEGENERATE_FRACTION:
+    return reject(DEGENERATE, f"{dark:.0%} of the image is darker than the threshold. Reduce the threshold.")
+
+  # Reduce the thickness of walls | Conservatively, so that only certain blanks are rejected
+  iterations: int = max(0, config.thickness_reduction_iterations // reduction - 1)
+  reduced = cv2.dilate(binary, np.ones((3, 3), np.uint8), iterations=iterations)
+  if cv2.countNonZero(reduced) == reduced.size:
+    return reject(
+      BLANK,
+      f"Every wall vanishes after {config.thickness_reduction_iterations} thickness reduction iterations. "
+      "Reduce the threshold and/or thickness reduction iterations.",
+    )
+  return None
+
+
+def check(path: str, config: Config, data: np.ndarray | None = None, image: np.ndarray | None = None) -> None:
+  """
+  Raises `InputRejected` if an input is unusable.
+
+  Args:
+      path (str): The path to the input image.
+      config (Config): An instance of the Config class containing configuration settings.
+      data (np.ndarray | None, optional): The encoded image, if it is not a file. Defaults to None (reads `path`).
+      image (np.ndarray | None, optional): The already-decoded image. Defaults to None.
+
+  Raises:
+      InputRejected: If `probe` rejects the input.
+  """
+  rejection: Rejection | None = probe(path, config, data=data, image=image)
+  if rejection is not None:
+    raise InputRejected(rejection)
+
+
+def _thumbnail(image: np.ndarray, path: str, reduction: int) -> np.ndarray:
+  """
+  Downscales an already-decoded image like `cv2.IMREAD_REDUCED_GRAYSCALE_*`: lossless formats are converted to
+  grayscale like their decoder, then resized with `INTER_LINEAR_EXACT` (identical to a reduced decode of 8-bit
+  images). JPEG decoders scale in the DCT domain, over blocks padded by replicating the edges, to sizes rounded up:
+  the thumbnail has the same size, and is approximated by `INTER_AREA` over the padded image (within 1 gray level,
+  3 on the last row and column).
+  """
+  gray = _gray(image, path)
+  height, width = gray.shape
+  if path.lower().endswith(JPEG_EXTENSIONS):
+    rows, columns = -(-height // reduction), -(-width // reduction)
+    padded = cv2.copyMakeBorder(
+      gray, 0, rows * reduction - height, 0, columns * reduction - width, cv2.BORDER_REPLICATE
+    )
+    return cv2.resize(padded, (columns, rows), interpolation=cv2.INTER_AREA)
+  return cv2.resize(gray, (width // reduction, height // reduction), interpolation=cv2.INTER_LINEAR_EXACT)
+
+
+def _gray(image: np.ndarray, path: str) -> np.ndarray:
+  """
+  Converts an already-decoded image to grayscale with the integer weights and rounding of its decoder (see
+  `DECODER_GRAY`), or `cv2.cvtColor` for other formats. Sums stay below 2^24, so float32 arithmetic is exact.
+  """
+  if image.ndim == 2:
+    return image
+  extension: str = path[path.rfind(".") :].lower()
+  if extension not in DECODER_GRAY:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+  weights, offset, shift = DECODER_GRAY[extension]
+  weighted = cv2.transform(image[..., :3].astype(np.float32), np.array([weights], np.float32))
+  return ((weighted + offset) * (1 / (1 << shift))).astype(np.uint8)
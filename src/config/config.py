@@ -4,23 +4,32 @@ It also includes a class definition for the configuration settings using Python'
 
 Dependencies:
 - `json`: Standard library for JSON operations.
+- `shutil`: Standard library for finding executables.
 - `sys`: Standard library for system-specific parameters and functions.
 - `loguru.logger`: For logging information.
 
+Constants:
+- `VERSION`: The version of the application.
+
 Classes:
 - `Config`: A dataclass representing the configuration settings.
 
 Functions:
 - `read_config(path: str = "config.json") -> Config`: Reads configuration from a JSON file and returns a `Config` object.
-- `log_config(config: Config) -> None`: Logs the configuration details and checks executable paths.
+- `log_config(config: Config) -> None`: Logs the configuration details and checks executable paths and value ranges.
+- `potrace_executable(config: Config) -> str | None`: Resolves the Potrace executable, or None if it is not installed.
 - `_check_exe_paths(config: Config) -> None`: Checks if the paths for Potrace and Typst executables are correctly set.
+- `_check_ranges(config: Config) -> None`: Checks if numeric settings are within their valid range.
 """
 
 import json
+import shutil
 import sys
 from dataclasses import dataclass
 from loguru import logger
 
+VERSION: str = "0.9.0"
+
 
 @dataclass(frozen=True, slots=True)
 class Config:
@@ -32,10 +41,29 @@ class Config:
       threshold_value (int): The threshold value for image processing.
       thickness_reduction_iterations (int): The number of iterations to reduce thickness.
       thickness_increase_iterations (int): The number of iterations to increase thickness.
-      potrace_path (str): The path to the Potrace executable.
+      potrace_path (str): The path to the Potrace executable, or its command name on `PATH`.
       typst_path (str): The path to the Typst executable.
       scale (int): The scale factor for processing.
       height (float): The height parameter for processing.
+      speck_min_area (int): Dark components with fewer pixels are removed before contour tracing. 0 disables.
+      speck_min_extent (int): Dark components with a smaller bounding box side are removed likewise. 0 disables.
+      typst_report (str): `full` inlines the vertex list, SVG and Blender script in the Typst document, `summary`
+          references them by path and only includes summary statistics and a truncated vertex table.
+      svg_optimize (bool): Whether to optimize the traced SVG (simplification, quantization, minification).
+      svg_precision (int): The number of decimals kept in SVG path coordinates. Negative values round to tens, etc.
+      svg_tolerance (float): The maximum deviation of a simplified SVG segment, in path units. 0 disables.
+      stage_threads (int): The number of threads running independent pipeline stages concurrently. 1 disables.
+      vertex_engine (str): The vertex-detection engine, `contour` (contour simplification) or `corner` (Shi-Tomasi).
+      corner_quality (float): `corner` engine: minimum corner response, relative to the strongest corner.
+      corner_min_distance (int): `corner` engine: minimum distance between two vertices, in pixels.
+      corner_scale (float): `corner` engine: resolution of the corner response relative to the image. 1 is exact.
+      simplify_threads (int): `contour` engine: the number of threads simplifying contours. 1 disables.
+      simplify_min_points (int): `contour` engine: contours with at most this many points are not simplified. 0
+          simplifies every contour.
+      buffer_pool_mb (int): The memory kept for reusing image buffers between images of the same size. 0 disables.
+      prefetch_depth (int): Batch runs: the number of images read and decoded ahead of processing. 0 disables.
+      prefetch_threads (int): Batch runs: the number of threads reading and decoding images ahead.
+      prefetch_memory_mb (int): Batch runs: the memory budget of the decoded images waiting to be processed.
   """
 
   filename: str
@@ -46,6 +74,23 @@ class Config:
   typst_path: str
   scale: int
   height: float
+  speck_min_area: int = 0
+  speck_min_extent: int = 0
+  typst_report: str = "full"
+  svg_optimize: bool = False
+  svg_precision: int = 0
+  svg_tolerance: float = 0
+  stage_threads: int = 2
+  vertex_engine: str = "contour"
+  corner_quality: float = 0.05
+  corner_min_distance: int = 5
+  corner_scale: float = 0.5
+  simplify_threads: int = 1
+  simplify_min_points: int = 0
+  buffer_pool_mb: int = 512
+  prefetch_depth: int = 2
+  prefetch_threads: int = 2
+  prefetch_memory_mb: int = 1024
 
 
 def read_config(path: str = "config.json") -> Config:
@@ -69,26 +114,59 @@ def read_config(path: str = "config.json") -> Config:
       data["typst_path"],
       data["scale"],
       data["height"],
+      data.get("speck_min_area", 0),
+      data.get("speck_min_extent", 0),
+      data.get("typst_report", "full"),
+      data.get("svg_optimize", False),
+      data.get("svg_precision", 0),
+      data.get("svg_tolerance", 0),
+      data.get("stage_threads", 2),
+      data.get("vertex_engine", "contour"),
+      data.get("corner_quality", 0.05),
+      data.get("corner_min_distance", 5),
+      data.get("corner_scale", 0.5),
+      data.get("simplify_threads", 1),
+      data.get("simplify_min_points", 0),
+      data.get("buffer_pool_mb", 512),
+      data.get("prefetch_depth", 2),
+      data.get("prefetch_threads", 2),
+      data.get("prefetch_memory_mb", 1024),
     )
 
 
 def log_config(config: Config) -> None:
   """
-  Logs the configuration details and checks executable paths.
+  Logs the configuration details and checks executable paths and value ranges.
 
   Args:
       config (Config): An instance of the `Config` dataclass containing the configuration settings.
   """
   _check_exe_paths(config)
+  _check_ranges(config)
   logs: list[str] = []
   logs.append("Read configuration successfully")
   logs.append(f"Filename = {config.filename}")
   logs.append(f"Threshold value = {config.threshold_value}")
   logs.append(f"Thickness reduction iterations = {config.thickness_reduction_iterations}")
   logs.append(f"Thickness increase iterations = {config.thickness_increase_iterations}")
+  logs.append(f"Vertex engine = {config.vertex_engine}")
+  logs.append(f"Speck filter = area < {config.speck_min_area} px or extent < {config.speck_min_extent} px")
   logger.info("\n".join(logs))
 
 
+def potrace_executable(config: Config) -> str | None:
+  """
+  Resolves the Potrace executable, either a path or a command name found on `PATH` (eg: `potrace`).
+
+  Args:
+      config (Config): An instance of the `Config` dataclass containing the configuration settings.
+
+  Returns:
+      str | None: The path to the Potrace executable, or None if it is not installed.
+  """
+  return shutil.which(config.potrace_path)
+
+
 def _check_exe_paths(config: Config) -> None:
   """
   Checks if the paths for Potrace and Typst executables are correctly set.
@@ -96,12 +174,15 @@ def _check_exe_paths(config: Config) -> None:
   Args:
       config (Config): An instance of the `Config` dataclass containing the configuration settings.
 
-  Logs an error and exits the program if the paths are not correctly set.
+  Logs a warning if Potrace is not installed (tracing falls back to a raster SVG).
+  Logs an error and exits the program if the Typst path is not correctly set.
   """
   error: bool = False
-  if not config.potrace_path.endswith("potrace.exe"):
-    error = True
-    logger.error("Set the path of the `Potrace` executable in `config/config.json`")
+  if potrace_executable(config) is None:
+    logger.warning(
+      f"Potrace not found at `{config.potrace_path}`. Traced SVGs fall back to a raster export. "
+      "Set the path of the `Potrace` executable in `config/config.json`"
+    )
     logger.info("Download from https://potrace.sourceforge.io/#downloading")
 
   if not config.typst_path.endswith("typst.exe"):
@@ -111,3 +192,17 @@ def _check_exe_paths(config: Config) -> None:
 
   if error:
     sys.exit()
+
+
+def _check_ranges(config: Config) -> None:
+  """
+  Checks if numeric settings are within their valid range.
+
+  Args:
+      config (Config): An instance of the `Config` dataclass containing the configuration settings.
+
+  Logs an error and exits the program if a setting is out of range.
+  """
+  if config.corner_scale <= 0:
+    logger.error(f"Set `corner_scale` to a value above 0 (eg: 0.5) in `config/config.json`, not {config.corner_scale}")
+    sys.exit(1)
@@ -4,23 +4,31 @@ It defines a dataclass for managing I/O paths and functions to generate and mana
 
 Dependencies:
 - `os`: Standard library for interacting with the operating system.
+- `collections.abc`: Standard library for the iterable type.
+- `loguru.logger`: For logging information.
 
 Classes:
 - `IO`: A dataclass representing various input/output paths.
 
 Functions:
-- `generate_io_paths(filename: str) -> IO`: Generates and returns an `IO` object with various input/output paths based on the given filename.
-- `generate_output_folder(filename: str) -> None`: Generates the necessary output directories based on the given filename.
+- `generate_io_paths(filename: str, input_dir: str = "input", output_dir: str = "output") -> IO`: Generates and returns an `IO` object with various input/output paths based on the given filename.
+- `generate_output_folder(filename: str, output_dir: str = "output") -> None`: Generates the necessary output directories based on the given filename.
+- `list_images(input_dir: str) -> list[str]`: Lists the filenames of the images in a directory.
+- `colliding(names: Iterable[str]) -> set[str]`: Returns the filenames that share their output folder with another.
 - `_generate_folder(path: str) -> None`: Creates a directory if it does not already exist.
 
 Constants:
 - `IMAGE`: Category for image outputs.
 - `DATA`: Category for data outputs.
+- `IMAGE_EXTENSIONS`: File extensions recognized as input images.
 """
 
 import os
+from collections.abc import Iterable
 from dataclasses import dataclass
 
+from loguru import logger
+
 
 @dataclass(frozen=True)
 class IO:
@@ -58,33 +66,38 @@ class IO:
 IMAGE = "image"
 DATA = "data"
 
+# Recognized input images
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
 
-def generate_io_paths(filename: str) -> IO:
+def generate_io_paths(filename: str, input_dir: str = "input", output_dir: str = "output") -> IO:
   """
   Generates and returns an `IO` object with various input/output paths based on the given filename.
 
   Args:
       filename (str): The name of the input file.
+      input_dir (str): The directory containing the input file. Defaults to "input".
+      output_dir (str): The root directory of the outputs. Defaults to "output".
 
   Returns:
       IO: An instance of the `IO` dataclass containing the generated input/output paths.
   """
   # Generate input path
-  input: str = f"input/{filename}"
+  input: str = f"{input_dir}/{filename}"
 
   # Generate outputs | Always save as .PNG
   base: str
   base, _ = os.path.splitext(filename)  # Discard extension
-  input_copy: str = f"output/{base}/{IMAGE}/input.png"
-  clean_background: str = f"output/{base}/{IMAGE}/clean-background.png"
-  cropped: str = f"output/{base}/{IMAGE}/cropped.bmp"  # Potrace requires BMP image format
-  cropped_copy: str = f"output/{base}/{IMAGE}/cropped.png"
-  svg: str = f"output/{base}/{IMAGE}/cropped.svg"
-  blender_script: str = f"output/{base}/blender.py"
-  typst_script: str = f"output/{base}/{IMAGE}/typst.typ"
-  raw_vertices: str = f"output/{base}/{IMAGE}/raw-vertices.png"
-  merged_vertices: str = f"output/{base}/{IMAGE}/merged-vertices.png"
-  coordinates: str = f"output/{base}/{DATA}/vertex-coordinates.txt"
+  input_copy: str = f"{output_dir}/{base}/{IMAGE}/input.png"
+  clean_background: str = f"{output_dir}/{base}/{IMAGE}/clean-background.png"
+  cropped: str = f"{output_dir}/{base}/{IMAGE}/cropped.bmp"  # Potrace requires BMP image format
+  cropped_copy: str = f"{output_dir}/{base}/{IMAGE}/cropped.png"
+  svg: str = f"{output_dir}/{base}/{IMAGE}/cropped.svg"
+  blender_script: str = f"{output_dir}/{base}/blender.py"
+  typst_script: str = f"{output_dir}/{base}/{IMAGE}/typst.typ"
+  raw_vertices: str = f"{output_dir}/{base}/{IMAGE}/raw-vertices.png"
+  merged_vertices: str = f"{output_dir}/{base}/{IMAGE}/merged-vertices.png"
+  coordinates: str = f"{output_dir}/{base}/{DATA}/vertex-coordinates.txt"
 
   # Return as object
   return IO(
@@ -102,21 +115,62 @@ def generate_io_paths(filename: str) -> IO:
   )
 
 
-def generate_output_folder(filename: str) -> None:
+def generate_output_folder(filename: str, output_dir: str = "output") -> None:
   """
   Generates the necessary output directories based on the given filename.
 
   Args:
       filename (str): The name of the input file.
+      output_dir (str): The root directory of the outputs. Defaults to "output".
   """
   base: str
   base, _ = os.path.splitext(filename)  # Discard extension
-  path: str = f"output/{base}"
+  path: str = f"{output_dir}/{base}"
   _generate_folder(path)
   _generate_folder(os.path.join(path, IMAGE))
   _generate_folder(os.path.join(path, DATA))
 
 
+def list_images(input_dir: str) -> list[str]:
+  """
+  Lists the filenames of the images in a directory, sorted by name.
+  Images that would share their output folder with another image (eg: `a.png` and `a.jpg`) are rejected with a
+  warning, as their outputs would overwrite each other.
+
+  Args:
+      input_dir (str): The directory to scan.
+
+  Returns:
+      list[str]: The filenames (not paths) of the images, filtered by `IMAGE_EXTENSIONS`.
+  """
+  names: list[str] = sorted(
+    name
+    for name in os.listdir(input_dir)
+    if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(os.path.join(input_dir, name))
+  )
+  rejected: set[str] = colliding(names)
+  if rejected:
+    logger.warning(f"Skipped images of `{input_dir}` sharing an output folder (rename them): {sorted(rejected)}")
+  return [name for name in names if name not in rejected]
+
+
+def colliding(names: Iterable[str]) -> set[str]:
+  """
+  Returns the filenames that share their output folder (`output/<base>/`) with another filename. Bases are compared
+  case-insensitively, as on Windows.
+
+  Args:
+      names (Iterable[str]): The filenames to check.
+
+  Returns:
+      set[str]: The filenames whose base is not unique.
+  """
+  bases: dict[str, list[str]] = {}
+  for name in names:
+    bases.setdefault(os.path.splitext(name)[0].lower(), []).append(name)
+  return {name for group in bases.values() if len(group) > 1 for name in group}
+
+
 def _generate_folder(path: str) -> None:
   """
   Creates a directory if it does not already exist.
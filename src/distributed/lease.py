@@ -0,0 +1,198 @@
+"""
+This module provides lease files for claiming work items on a shared filesystem.
+A lease is a small file created with `O_CREAT | O_EXCL`, so exactly one worker can hold it at a time.
+Its modification time is the heartbeat: a lease that has not been renewed within `lease_seconds` is considered
+abandoned by a crashed worker and can be recovered by any other worker. Recovery is serialized by a `.recover` lock
+file next to the lease, so a live lease is never moved, even briefly.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `time`: Standard library for time access.
+- `uuid`: Standard library for generating unique identifiers.
+- `dataclasses.dataclass`: For defining the lease record.
+
+Classes:
+- `Lease`: A dataclass representing a held lease.
+
+Functions:
+- `claim(lease_dir: str, name: str, worker_id: str, lease_seconds: float) -> Lease | None`: Attempts to claim a work item.
+- `renew(lease: Lease) -> bool`: Refreshes the heartbeat of a held lease.
+- `holds(lease: Lease) -> bool`: Checks that a lease is still owned by its holder.
+- `release(lease: Lease) -> None`: Releases a held lease.
+- `_recover_expired(path: str, lease_seconds: float, worker_id: str) -> bool`: Removes an expired lease.
+- `_expired(path: str, lease_seconds: float) -> bool`: Checks if a file has not been touched within `lease_seconds`.
+- `_read_token(path: str) -> str | None`: Reads the token stored in a lease file.
+"""
+
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Lease:
+  """
+  A dataclass to hold a claimed lease.
+
+  Attributes:
+      path (str): Path to the lease file.
+      name (str): Name of the claimed work item.
+      token (str): Unique token written into the lease file, identifying this claim.
+  """
+
+  path: str
+  name: str
+  token: str
+
+
+def claim(lease_dir: str, name: str, worker_id: str, lease_seconds: float) -> Lease | None:
+  """
+  Attempts to claim a work item by atomically creating its lease file.
+
+  Args:
+      lease_dir (str): The shared directory holding lease files.
+      name (str): The name of the work item (an input filename).
+      worker_id (str): A human-readable identifier of the claiming worker.
+      lease_seconds (float): Time without a heartbeat after which a lease is considered abandoned.
+
+  Returns:
+      Lease | None: The held lease, or None if another worker holds a live lease on the item.
+  """
+  path: str = os.path.join(lease_dir, f"{name}.lease")
+  token: str = f"{worker_id}:{uuid.uuid4().hex}"
+  for _ in range(2):  # Second attempt only after recovering an expired lease
+    try:
+      fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+      if not _recover_expired(path, lease_seconds, worker_id):
+        return None
+      continue
+    with os.fdopen(fd, "w") as file:
+      file.write(token)
+    return Lease(path, name, token)
+  return None
+
+
+def renew(lease: Lease) -> bool:
+  """
+  Refreshes the heartbeat of a held lease.
+
+  Args:
+      lease (Lease): The lease to renew.
+
+  Returns:
+      bool: True if the lease is still held and was renewed, False if it was lost.
+  """
+  if not holds(lease):
+    return False
+  os.utime(lease.path)
+  return True
+
+
+def holds(lease: Lease) -> bool:
+  """
+  Checks that a lease is still owned by its holder.
+
+  Args:
+      lease (Lease): The lease to check.
+
+  Returns:
+      bool: True if the lease file exists and contains the holder's token.
+  """
+  return _read_token(lease.path) == lease.token
+
+
+def release(lease: Lease) -> None:
+  """
+  Releases a held lease. Leases recovered by another worker are left untouched.
+
+  Args:
+      lease (Lease): The lease to release.
+  """
+  if holds(lease):
+    try:
+      os.remove(lease.path)
+    except FileNotFoundError:
+      pass
+
+
+def _recover_expired(path: str, lease_seconds: float, worker_id: str) -> bool:
+  """
+  Removes an expired lease so that it can be claimed again.
+  Recovering workers first take a `.recover` lock with `O_CREAT | O_EXCL`, then check and remove the lease in place,
+  so that the holder of a live lease never sees it disappear. A lock left by a crashed worker expires like a lease.
+
+  Args:
+      path (str): Path to the lease file.
+      lease_seconds (float): Time without a heartbeat after which a lease is considered abandoned.
+      worker_id (str): A human-readable identifier of the recovering worker.
+
+  Returns:
+      bool: True if the lease was expired (or vanished) and has been removed, False if it is still live or another
+      worker is recovering it.
+  """
+  token: str | None = _read_token(path)
+  try:
+    if not _expired(path, lease_seconds):
+      return False
+  except FileNotFoundError:
+    return True  # Released in the meantime
+
+  lock: str = f"{path}.recover"
+  try:
+    fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+  except FileExistsError:
+    try:
+      if _expired(lock, lease_seconds):
+        os.remove(lock)  # Left by a crashed worker -> retried by the next claim
+    except FileNotFoundError:
+      pass
+    return False
+  try:
+    with os.fdopen(fd, "w") as file:
+      file.write(worker_id)
+    # Only lock holders remove leases -> the lease is either the checked one (possibly renewed) or a new claim
+    try:
+      if _read_token(path) != token or not _expired(path, lease_seconds):
+        return False
+      os.remove(path)
+    except FileNotFoundError:
+      pass
+    return True
+  finally:
+    os.remove(lock)
+
+
+def _expired(path: str, lease_seconds: float) -> bool:
+  """
+  Checks if a file has not been touched within `lease_seconds`.
+
+  Args:
+      path (str): Path to the file.
+      lease_seconds (float): Time without a heartbeat after which a lease is considered abandoned.
+
+  Returns:
+      bool: True if the file is older than `lease_seconds`.
+
+  Raises:
+      FileNotFoundError: If the file does not exist.
+  """
+  return time.time() - os.path.getmtime(path) > lease_seconds
+
+
+def _read_token(path: str) -> str | None:
+  """
+  Reads the token stored in a lease file.
+
+  Args:
+      path (str): Path to the lease file.
+
+  Returns:
+      str | None: The token, or None if the lease file does not exist.
+  """
+  try:
+    with open(path, "r") as file:
+      return file.read()
+  except FileNotFoundError:
+    return None
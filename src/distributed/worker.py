@@ -0,0 +1,324 @@
+"""
+This module provides a distributed runner that lets several workers, on one or many hosts, process the images of a
+shared input directory without clobbering each other's outputs.
+
+Workers claim input images through lease files (see `src.distributed.lease`), run the pipeline into a private staging
+folder and publish the finished `output/<base>/` folder with a single rename. Leases of crashed workers expire and are
+recovered by the remaining workers. The next pending images are read and decoded ahead by a `Prefetcher`
+(`config.prefetch_depth`), skipping images leased by other workers, while the current image is processed.
+
+Queue layout (inside the shared output directory):
+- `.queue/leases/<filename>.lease`: Held by the worker currently processing `<filename>`.
+- `.queue/staging/<token>/<base>/`: Private outputs of an in-progress run.
+- `.queue/done/<filename>`: Marker written once the outputs of `<filename>` are published.
+- `.queue/failed/<filename>`: Marker holding the error of a failed run. Delete it to retry.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `shutil`: Standard library for high-level file operations.
+- `socket`: Standard library for the host name.
+- `threading`: Standard library for the heartbeat thread.
+- `time`: Standard library for time access.
+- `multiprocessing`: Standard library for running several local workers.
+- `dataclasses.replace`: For deriving a per-image configuration.
+- `cv2`: OpenCV library for reading images ahead.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `src.check.probe.InputRejected`: Custom exception for unusable inputs.
+- `src.config.config`: Custom module for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.distributed.lease`: Custom module for lease files.
+- `src.pipeline.pipeline`: Custom module running the per-image pipeline.
+- `src.source.prefetch.Prefetcher`: Custom class reading images ahead of the pipeline.
+- `src.utility.save`: Custom module for atomic file writes.
+
+Functions:
+- `run(config: Config, workers: int, input_dir: str, output_dir: str, lease_seconds: float, poll_seconds: float) -> None`: Runs local worker processes until the queue is drained.
+- `work(config: Config, input_dir: str, output_dir: str, lease_seconds: float, poll_seconds: float, worker_id: str | None = None) -> int`: Claims and processes images until the queue is drained.
+- `_pending(input_dir: str, queue_dir: str) -> list[str]`: Lists input images that are neither done nor failed.
+- `_finished(queue_dir: str, name: str) -> bool`: Checks if an image is done or failed.
+- `_read(input_dir: str, queue_dir: str, name: str) -> np.ndarray | None`: Reads a pending image ahead, unless leased.
+- `_process(lease: Lease, config: Config, input_dir: str, output_dir: str, queue_dir: str, lease_seconds: float, image: np.ndarray | None = None) -> bool`: Processes one claimed image.
+- `_publish(staged: str, final: str, trash_dir: str) -> None`: Moves a finished output folder into place.
+- `_heartbeat(lease: Lease, stop: threading.Event, interval: float) -> None`: Renews a lease until stopped.
+"""
+
+import multiprocessing
+import os
+import shutil
+import socket
+import threading
+import time
+from dataclasses import replace
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.check.probe import InputRejected
+from src.config import location
+from src.config.config import VERSION, Config
+from src.distributed import lease as leases
+from src.distributed.lease import Lease
+from src.pipeline import pipeline
+from src.source.prefetch import Prefetcher
+from src.utility import save
+
+# Queue folders
+QUEUE = ".queue"
+LEASES = "leases"
+STAGING = "staging"
+DONE = "done"
+FAILED = "failed"
+TRASH = "trash"
+
+
+def run(
+  config: Config,
+  workers: int = 1,
+  input_dir: str = "input",
+  output_dir: str = "output",
+  lease_seconds: float = 120,
+  poll_seconds: float = 2,
+) -> None:
+  """
+  Runs local worker processes until the queue is drained. Other hosts may run workers on the same directories.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      workers (int, optional): The number of local worker processes. Defaults to 1.
+      input_dir (str, optional): The shared directory containing input images. Defaults to "input".
+      output_dir (str, optional): The shared root directory of the outputs. Defaults to "output".
+      lease_seconds (float, optional): Time without a heartbeat after which a lease is recovered. Defaults to 120.
+      poll_seconds (float, optional): Wait between scans while other workers hold the remaining images. Defaults to 2.
+  """
+  args = (config, input_dir, output_dir, lease_seconds, poll_seconds)
+  if workers <= 1:
+    work(*args)
+    return
+
+  processes = [multiprocessing.Process(target=work, args=args) for _ in range(workers)]
+  for process in processes:
+    process.start()
+  for process in processes:
+    process.join()
+
+
+def work(
+  config: Config,
+  input_dir: str,
+  output_dir: str,
+  lease_seconds: float,
+  poll_seconds: float,
+  worker_id: str | None = None,
+) -> int:
+  """
+  Claims and processes images until every input image is done or failed.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings, including the
+          `prefetch_*` settings.
+      input_dir (str): The shared directory containing input images.
+      output_dir (str): The shared root directory of the outputs.
+      lease_seconds (float): Time without a heartbeat after which a lease is recovered.
+      poll_seconds (float): Wait between scans while other workers hold the remaining images.
+      worker_id (str | None, optional): Identifier of this worker. Defaults to `<hostname>-<pid>`.
+
+  Returns:
+      int: The number of images processed by this worker.
+  """
+  worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+  queue_dir: str = os.path.join(output_dir, QUEUE)
+  for folder in (LEASES, STAGING, DONE, FAILED, TRASH):
+    os.makedirs(os.path.join(queue_dir, folder), exist_ok=True)
+
+  processed: int = 0
+  waited: float = 0
+  while pending := _pending(input_dir, queue_dir):
+    claimed: bool = False
+    images = Prefetcher(
+      pending,
+      lambda name: _read(input_dir, queue_dir, name),
+      config.prefetch_depth,
+      config.prefetch_threads,
+      config.prefetch_memory_mb * 1024 * 1024,
+    )
+    with images:
+      for name, image in images:
+        lease = leases.claim(os.path.join(queue_dir, LEASES), name, worker_id, lease_seconds)
+        if lease is None:
+          continue
+        if _finished(queue_dir, name):  # Published and released by another worker since the scan
+          leases.release(lease)
+          continue
+        claimed = True
+        try:
+          processed += _process(lease, config, input_dir, output_dir, queue_dir, lease_seconds, image)
+        finally:
+          leases.release(lease)
+        del image  # Release the image before taking the next one
+    waited += images.waited
+    if claimed:
+      logger.info(images.summary())
+
+    # Remaining images are held by other workers -> wait for them to finish or for their leases to expire
+    if not claimed:
+      time.sleep(poll_seconds)
+
+  logger.info(f"Worker `{worker_id}` drained the queue after processing {processed} images ({waited:.2f} s on input)")
+  return processed
+
+
+def _pending(input_dir: str, queue_dir: str) -> list[str]:
+  """
+  Lists input images that are neither done nor failed.
+
+  Args:
+      input_dir (str): The shared directory containing input images.
+      queue_dir (str): The shared queue directory.
+
+  Returns:
+      list[str]: Filenames of the pending input images.
+  """
+  finished = set(os.listdir(os.path.join(queue_dir, DONE))) | set(os.listdir(os.path.join(queue_dir, FAILED)))
+  return [name for name in location.list_images(input_dir) if name not in finished]
+
+
+def _finished(queue_dir: str, name: str) -> bool:
+  """
+  Checks if an image is done or failed. Markers are written before leases are released, so checking after claiming
+  a lease is race-free.
+
+  Args:
+      queue_dir (str): The shared queue directory.
+      name (str): The filename of the image.
+
+  Returns:
+      bool: True if a done or failed marker exists for the image.
+  """
+  return os.path.exists(os.path.join(queue_dir, DONE, name)) or os.path.exists(os.path.join(queue_dir, FAILED, name))
+
+
+def _read(input_dir: str, queue_dir: str, name: str) -> np.ndarray | None:
+  """
+  Reads a pending image ahead of processing. Runs in an I/O thread.
+  Images leased by another worker are skipped, as they will most likely not be processed by this worker.
+
+  Args:
+      input_dir (str): The shared directory containing input images.
+      queue_dir (str): The shared queue directory.
+      name (str): The filename of the image.
+
+  Returns:
+      np.ndarray | None: The decoded image, or None if it is leased (the pipeline then reads it if claimed later).
+  """
+  if os.path.exists(os.path.join(queue_dir, LEASES, f"{name}.lease")):
+    return None
+  return cv2.imread(os.path.join(input_dir, name))
+
+
+def _process(
+  lease: Lease,
+  config: Config,
+  input_dir: str,
+  output_dir: str,
+  queue_dir: str,
+  lease_seconds: float,
+  image: np.ndarray | None = None,
+) -> bool:
+  """
+  Processes one claimed image into a staging folder and publishes it.
+
+  Args:
+      lease (Lease): The lease held on the image.
+      config (Config): An instance of the Config class containing configuration settings.
+      input_dir (str): The shared directory containing input images.
+      output_dir (str): The shared root directory of the outputs.
+      queue_dir (str): The shared queue directory.
+      lease_seconds (float): Time without a heartbeat after which a lease is recovered.
+      image (np.ndarray | None, optional): The image, if it was read ahead. Defaults to None (read by the pipeline).
+
+  Process:
+      1. Starts a heartbeat thread that renews the lease.
+      2. Runs the pipeline with all outputs redirected to a private staging folder.
+      3. Publishes the staged folder to `output/<base>/` if the lease is still held.
+      4. Writes a done marker, or a failed marker holding the error.
+      5. Removes the staging folder.
+
+  Returns:
+      bool: True if the outputs were published, False otherwise.
+  """
+  name: str = lease.name
+  base: str = os.path.splitext(name)[0]
+  staging_root: str = os.path.join(queue_dir, STAGING, lease.token.replace(":", "-"))
+
+  stop = threading.Event()
+  heartbeat = threading.Thread(target=_heartbeat, args=(lease, stop, lease_seconds / 3), daemon=True)
+  heartbeat.start()
+  try:
+    image_config: Config = replace(config, filename=name)
+    io = location.generate_io_paths(name, input_dir, staging_root)
+    published = location.generate_io_paths(name, input_dir, output_dir)
+    location.generate_output_folder(name, staging_root)
+    pipeline.run(io, image_config, VERSION, published, image=image)
+
+    if not leases.holds(lease):
+      logger.warning(f"Lease on `{name}` was lost. Discarding staged outputs.")
+      return False
+
+    _publish(os.path.join(staging_root, base), os.path.join(output_dir, base), os.path.join(queue_dir, TRASH))
+    save.write_atomic(os.path.join(queue_dir, DONE, name), lease.token)
+    logger.info(f"Published outputs of `{name}` in `{os.path.join(output_dir, base)}`")
+    return True
+  except (InputRejected, OSError, ValueError, cv2.error) as error:  # Unusable input, I/O or processing failure
+    save.write_atomic(os.path.join(queue_dir, FAILED, name), f"{lease.token}\n{error!r}\n")
+    logger.error(f"Failed to process `{name}`: {error!r}")
+    return False
+  finally:
+    stop.set()
+    heartbeat.join()
+    shutil.rmtree(staging_root, ignore_errors=True)
+
+
+def _publish(staged: str, final: str, trash_dir: str) -> None:
+  """
+  Moves a finished output folder into place with a rename.
+  Previous outputs are first renamed into the trash folder, as directories cannot be replaced while non-empty.
+
+  Args:
+      staged (str): The staged output folder.
+      final (str): The final output folder.
+      trash_dir (str): The folder receiving previous outputs before deletion.
+  """
+  previous: str | None = None
+  if os.path.exists(final):
+    previous = os.path.join(trash_dir, f"{os.path.basename(final)}-{os.path.basename(os.path.dirname(staged))}")
+    os.rename(final, previous)
+  os.rename(staged, final)
+  if previous:
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def _heartbeat(lease: Lease, stop: threading.Event, interval: float) -> None:
+  """
+  Renews a lease every `interval` seconds until stopped.
+  A failed renewal is retried at the next interval rather than ending the heartbeat, so a transient failure (eg: a
+  slow shared filesystem) does not let the lease expire. A lease that is really lost is detected by `_process`.
+
+  Args:
+      lease (Lease): The lease to renew.
+      stop (threading.Event): Event signalling the end of processing.
+      interval (float): Seconds between renewals. Must be well below the lease duration.
+  """
+  lost: bool = False
+  while not stop.wait(interval):
+    try:
+      renewed: bool = leases.renew(lease)
+    except OSError as error:
+      renewed = False
+      logger.debug(f"Failed to renew the lease on `{lease.name}`: {error!r}")
+    if not renewed and not lost:
+      logger.warning(f"Failed to renew the lease on `{lease.name}`. Retrying.")
+    elif renewed and lost:
+      logger.info(f"Renewed the lease on `{lease.name}` again")
+    lost = not renewed
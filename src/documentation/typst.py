@@ -7,20 +7,31 @@ Dependencies:
 - `shutil`: Standard library for high-level file operations.
 - `datetime`: Standard library for date and time operations.
 - `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
 - `loguru.logger`: For logging information.
 - `src.config.config.Config`: Custom class for configuration settings.
 - `src.config.location.IO`: Custom class for input/output paths.
+- `src.evaluation.vertices.read_vertices`: Reads the vertex coordinates of a summary report.
+- `src.metrics.metrics`: Records the duration and failures of Typst runs.
+
+Constants:
+- `VERTEX_ROWS`: The number of vertices listed in a summary report.
 
 Functions:
-- `generate_typst_document(io: IO, config: Config, version: str) -> None`: Generates a Typst document using the provided configuration and input data.
+- `generate_typst_document(io: IO, config: Config, version: str, dimensions: tuple[int, int] | None = None, image: np.ndarray | None = None, published: IO | None = None) -> None`: Generates a Typst document using the provided configuration and input data.
+- `generate_pages_report(path: str, config: Config, version: str, rows: list[tuple[str, str, str, str, str]]) -> None`: Generates a combined Typst report of a multi-page input.
 - `_read_typst_script_template() -> str`: Reads the Typst script template from a file.
+- `_read_typst_summary_template() -> str`: Reads the summary Typst script template from a file.
+- `_fill_summary(io: IO, template: str, published: IO | None = None) -> str`: Fills the summary statistics, artifact paths and truncated vertex table.
 - `_get_current_time() -> tuple[str, str]`: Returns the current time and date as strings.
 - `_get_image_dimensions(im_path: str) -> tuple[int, int]`: Returns the dimensions of an image.
 - `_read_vertices(io: IO) -> str`: Reads vertex coordinates from a file.
+- `_format_size(path: str) -> str`: Returns the human-readable size of a file.
 - `_read_raw_svg(io: IO) -> str`: Reads the raw SVG content from a file.
 - `_read_raw_blender_script(io: IO) -> str`: Reads the raw Blender script content from a file.
 - `_generate_full_path(path: str) -> str`: Generates a full absolute path, formatted for Unix-style paths.
 - `_save_typst_script(io: IO, template: str) -> None`: Saves the generated Typst script to a file.
+- `_compile(config: Config, path: str) -> None`: Compiles a Typst document.
 """
 
 import os
@@ -28,12 +39,24 @@ import shutil
 import subprocess
 from datetime import datetime
 import cv2
+import numpy as np
 from loguru import logger
 from src.config.config import Config
 from src.config.location import IO
+from src.evaluation.vertices import read_vertices
+from src.metrics import metrics
+
+VERTEX_ROWS = 50  # Vertices listed in a summary report
 
 
-def generate_typst_document(io: IO, config: Config, version: str) -> None:
+def generate_typst_document(
+  io: IO,
+  config: Config,
+  version: str,
+  dimensions: tuple[int, int] | None = None,
+  image: np.ndarray | None = None,
+  published: IO | None = None,
+) -> None:
   """
   Generates a Typst document using the provided configuration and input data.
 
@@ -41,23 +64,37 @@ def generate_typst_document(io: IO, config: Config, version: str) -> None:
       io (IO): An instance of the IO class containing input/output paths.
       config (Config): An instance of the Config class containing configuration settings.
       version (str): The version of the document.
+      dimensions (tuple[int, int] | None, optional): The width and height of the already-decoded input image.
+          Defaults to None, in which case the input image is read again.
+      image (np.ndarray | None, optional): The decoded input image, saved instead of copying `io.input` when the
+          input is not a file (eg: an archive member). Defaults to None.
+      published (IO | None, optional): The paths the outputs will be moved to after the run, linked by a summary
+          report instead of the paths in `io`. Defaults to None.
 
   Process:
-      1. Reads the Typst script template.
+      1. Reads the full or summary Typst script template, depending on `config.typst_report`.
       2. Gets the current time and date.
       3. Gets the dimensions of the input image.
-      4. Reads vertex coordinates, raw SVG content, and raw Blender script content.
+      4. Full: reads vertex coordinates, raw SVG content, and raw Blender script content.
+         Summary: computes summary statistics, artifact paths and a truncated vertex table.
       5. Replaces placeholders in the template with actual values.
-      6. Copies the input image to the output directory.
+      6. Copies (or saves) the input image to the output directory.
       7. Saves the final Typst script.
   """
-  template: str = _read_typst_script_template()
+  summary: bool = config.typst_report == "summary"
+  template: str = _read_typst_summary_template() if summary else _read_typst_script_template()
 
   time, date = _get_current_time()
-  width, height = _get_image_dimensions(io.input)
-  vertex_coordinates: str = _read_vertices(io)
-  raw_svg: str = _read_raw_svg(io)
-  raw_blender_script: str = _read_raw_blender_script(io)
+  width, height = dimensions or _get_image_dimensions(io.input)
+
+  if summary:
+    template = _fill_summary(io, template, published)
+  else:
+    template = (
+      template.replace("#VERTEX-LIST-PLACEHOLDER#", _read_vertices(io))
+      .replace("#SVG-PLACEHOLDER#", _read_raw_svg(io))
+      .replace("#BLENDER-SCRIPT-PLACEHOLDER#", _read_raw_blender_script(io))
+    )
 
   template = (
     template.replace("#VERSION-PLACEHOLDER#", version)
@@ -71,18 +108,69 @@ def generate_typst_document(io: IO, config: Config, version: str) -> None:
     .replace("#HEIGHT-PLACEHOLDER#", str(config.height))
     .replace("#IMAGE-WIDTH-PLACEHOLDER#", str(width))
     .replace("#IMAGE-HEIGHT-PLACEHOLDER#", str(height))
-    .replace("#VERTEX-LIST-PLACEHOLDER#", vertex_coordinates)
-    .replace("#SVG-PLACEHOLDER#", raw_svg)
-    .replace("#BLENDER-SCRIPT-PLACEHOLDER#", raw_blender_script)
   )
 
-  shutil.copyfile(io.input, io.input_copy)  # Typst cannot read from parent directory, so a copy is made
+  # Typst cannot read from parent directory, so a copy is made
+  if image is None:
+    shutil.copyfile(io.input, io.input_copy)
+  else:
+    cv2.imwrite(io.input_copy, image)
   _save_typst_script(io, template)
   logger.info(f"Saved Typst document in `{io.typst_script}")
-  subprocess.run([config.typst_path, "compile", io.typst_script], capture_output=True)
+  _compile(config, io.typst_script)
   logger.info("Compiled Typst document\n")
 
 
+def generate_pages_report(path: str, config: Config, version: str, rows: list[tuple[str, str, str, str, str]]) -> None:
+  """
+  Generates a combined Typst report of a multi-page input, with one table row and one figure per page.
+
+  Args:
+      path (str): The path of the report. Page folders must be next to it, as Typst cannot read from parent directory.
+      config (Config): An instance of the Config class containing configuration settings.
+      version (str): The version of the document.
+      rows (list[tuple[str, str, str, str, str]]): Page number, page folder, vertex count, seconds and status of
+          every page.
+
+  Process:
+      1. Reads the pages report template.
+      2. Replaces placeholders with the configuration and one table row per page.
+      3. Adds the merged vertices overlay of every successful page as a figure.
+      4. Saves and compiles the report.
+  """
+  with open("src/documentation/pages_template.txt", "r") as file:
+    template: str = file.read()
+
+  time, date = _get_current_time()
+  table_rows: str = "\n".join(
+    f"  [{page}], [`{name}`], [{vertices}], [{seconds}], [`{status}`],"
+    for page, name, vertices, seconds, status in rows
+  )
+  figures: str = "\n".join(
+    f'#figure(rect(image("{name}/image/merged-vertices.png")), caption: [Page {page}])'
+    for page, name, _, _, status in rows
+    if status == "OK"
+  )
+
+  template = (
+    template.replace("#VERSION-PLACEHOLDER#", version)
+    .replace("#TIME-PLACEHOLDER#", time)
+    .replace("#DATE-PLACEHOLDER#", date)
+    .replace("#FILENAME-PLACEHOLDER#", str(config.filename))
+    .replace("#THRESHOLD-PLACEHOLDER#", str(config.threshold_value))
+    .replace("#TRI-PLACEHOLDER#", str(config.thickness_reduction_iterations))
+    .replace("#TII-PLACEHOLDER#", str(config.thickness_increase_iterations))
+    .replace("#PAGE-ROWS-PLACEHOLDER#", table_rows)
+    .replace("#PAGE-FIGURES-PLACEHOLDER#", figures)
+  )
+
+  with open(path, "w") as file:
+    file.write(template)
+  logger.info(f"Saved combined Typst report in `{path}`")
+  _compile(config, path)
+  logger.info("Compiled combined Typst report\n")
+
+
 def _read_typst_script_template() -> str:
   """
   Reads the Typst script template from a file.
@@ -94,6 +182,57 @@ def _read_typst_script_template() -> str:
     return file.read()
 
 
+def _read_typst_summary_template() -> str:
+  """
+  Reads the summary Typst script template from a file.
+
+  Returns:
+      str: The content of the summary Typst script template.
+  """
+  with open("src/documentation/typst_summary_template.txt", "r") as file:
+    return file.read()
+
+
+def _fill_summary(io: IO, template: str, published: IO | None = None) -> str:
+  """
+  Fills the summary statistics, artifact paths and truncated vertex table of the summary template.
+  The SVG and the Blender script are referenced by path and never read.
+
+  Args:
+      io (IO): An instance of the IO class containing input/output paths.
+      template (str): The summary Typst script template.
+      published (IO | None, optional): The paths the outputs will be moved to after the run, linked instead of the
+          paths in `io`. Defaults to None.
+
+  Returns:
+      str: The template with summary placeholders replaced.
+  """
+  links: IO = published or io
+  vertices: np.ndarray = read_vertices(io.coordinates).astype(np.int64)
+
+  bounds: str = "-"
+  if len(vertices):
+    (x_min, y_min), (x_max, y_max) = vertices.min(axis=0), vertices.max(axis=0)
+    bounds = f"$({x_min}, {y_min}) - ({x_max}, {y_max})$"
+
+  rows: str = "\n".join(f"  [{i + 1}], [{x}], [{y}]," for i, (x, y) in enumerate(vertices[:VERTEX_ROWS].tolist()))
+  truncation: str = ""
+  if len(vertices) > VERTEX_ROWS:
+    truncation = f"_{len(vertices) - VERTEX_ROWS} more vertices in_ `{_generate_full_path(links.coordinates)}`"
+
+  return (
+    template.replace("#VERTEX-COUNT-PLACEHOLDER#", str(len(vertices)))
+    .replace("#VERTEX-BOUNDS-PLACEHOLDER#", bounds)
+    .replace("#SVG-SIZE-PLACEHOLDER#", _format_size(io.svg))
+    .replace("#BLENDER-SIZE-PLACEHOLDER#", _format_size(io.blender_script))
+    .replace("#VERTEX-PATH-PLACEHOLDER#", _generate_full_path(links.coordinates))
+    .replace("#SVG-PATH-PLACEHOLDER#", _generate_full_path(links.svg))
+    .replace("#BLENDER-PATH-PLACEHOLDER#", _generate_full_path(links.blender_script))
+    .replace("#VERTEX-ROWS-PLACEHOLDER#", rows)
+    .replace("#VERTEX-TRUNCATION-PLACEHOLDER#", truncation)
+  )
+
+
 def _get_current_time() -> tuple[str, str]:
   """
   Returns the current time and date as strings.
@@ -115,7 +254,7 @@ def _get_image_dimensions(im_path: str) -> tuple[int, int]:
       tuple[int, int]: A tuple containing the width and height of the image.
   """
   im = cv2.imread(im_path)
-  return im.shape[0], im.shape[1]
+  return im.shape[1], im.shape[0]
 
 
 def _read_vertices(io: IO) -> str:
@@ -160,6 +299,21 @@ def _read_raw_blender_script(io: IO) -> str:
     return file.read()
 
 
+def _format_size(path: str) -> str:
+  """
+  Returns the human-readable size of a file without reading it.
+
+  Args:
+      path (str): The path to the file.
+
+  Returns:
+      str: The size in kB, or "-" if the file does not exist.
+  """
+  if not os.path.exists(path):
+    return "-"
+  return f"{os.path.getsize(path) / 1024:.1f} kB"
+
+
 def _generate_full_path(path: str) -> str:
   """
   Generates a full absolute path, formatted for Unix-style paths.
@@ -184,3 +338,22 @@ def _save_typst_script(io: IO, template: str) -> None:
   """
   with open(io.typst_script, "w") as file:
     file.write(template)
+
+
+def _compile(config: Config, path: str) -> None:
+  """
+  Compiles a Typst document, recording the duration of the run and counting it as failed on a non-zero exit code.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      path (str): The path to the Typst document.
+  """
+  try:
+    with metrics.timer(metrics.TOOL_SECONDS, tool="typst"):
+      result = subprocess.run([config.typst_path, "compile", path], check=False, capture_output=True)
+  except OSError:
+    metrics.inc(metrics.TOOL_FAILURES, tool="typst")
+    raise
+  if result.returncode != 0:
+    metrics.inc(metrics.TOOL_FAILURES, tool="typst")
+    logger.error(f"Typst exited with code {result.returncode}: {result.stderr.decode(errors='replace').strip()}")
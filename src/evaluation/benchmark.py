@@ -0,0 +1,212 @@
+"""
+This module provides benchmarks of the processing steps on a directory of images.
+
+Dependencies:
+- `time`: Standard library for time access.
+- `dataclasses`: For the measurement records and deriving a per-image configuration.
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `src.check.probe.InputRejected`: Custom exception for unusable inputs.
+- `src.clean.background`: Custom module for background cleaning.
+- `src.config.config.Config`: Custom class for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.process`: Custom modules for vertex detection, speck removal and the vertex-detection engines.
+- `src.utility.pool`: Custom module providing reusable image buffers.
+
+Classes:
+- `Measurement`: A dataclass representing one benchmark run on one image.
+- `Scaling`: A dataclass representing one contour simplification run on one image.
+
+Functions:
+- `buffers(input_dir: str, config: Config, output_dir: str) -> list[Measurement]`: Compares pooled and fresh buffers.
+- `summarize(measurements: list[Measurement]) -> str`: Formats per-mode averages side by side.
+- `simplify(input_dir: str, config: Config, threads: tuple[int, ...] = (1, 2, 4, 8), repeat: int = 3) -> list[Scaling]`: Measures contour simplification per thread count.
+- `summarize_scaling(scalings: list[Scaling]) -> str`: Formats per-thread-count totals and speedups.
+"""
+
+import time
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.check.probe import InputRejected
+from src.clean import background
+from src.config import location
+from src.config.config import Config
+from src.process import edge, engine, speck
+from src.utility import pool
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+  """
+  A dataclass to hold one benchmark run on one image.
+
+  Attributes:
+      mode (str): The variant being measured (eg: `pooled` or `unpooled`).
+      image (str): The filename of the image.
+      requests (int): The number of full-size buffers the steps asked for.
+      allocations (int): The number of full-size buffers that had to be allocated.
+      seconds (float): The runtime of the steps.
+  """
+
+  mode: str
+  image: str
+  requests: int
+  allocations: int
+  seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class Scaling:
+  """
+  A dataclass to hold one contour simplification run on one image.
+
+  Attributes:
+      threads (int): The number of simplification threads.
+      image (str): The filename of the image.
+      contours (int): The number of contours simplified.
+      seconds (float): The best runtime of the simplification.
+      identical (bool): Whether the result is identical to the single-threaded result.
+  """
+
+  threads: int
+  image: str
+  contours: int
+  seconds: float
+  identical: bool
+
+
+def buffers(input_dir: str, config: Config, output_dir: str) -> list[Measurement]:
+  """
+  Runs background cleaning and vertex detection on every image of a directory, first allocating fresh buffers for
+  every image, then reusing them through the buffer pool (`config.buffer_pool_mb`).
+
+  Args:
+      input_dir (str): The directory containing the images.
+      config (Config): An instance of the Config class containing configuration settings.
+      output_dir (str): The root directory of the outputs.
+
+  Returns:
+      list[Measurement]: One measurement per mode and image. The first pooled image allocates like an unpooled one,
+      every following image of the same size allocates nothing. Rejected images (eg: blank pages) are logged and
+      not measured.
+  """
+  images = location.list_images(input_dir)
+  logger.info(f"Benchmarking buffer reuse on {len(images)} images")
+
+  measurements: list[Measurement] = []
+  max_bytes: int = pool.POOL.max_bytes
+  try:
+    for mode, mode_bytes in (("unpooled", 0), ("pooled", config.buffer_pool_mb * 1024 * 1024)):
+      pool.POOL.clear()
+      pool.POOL.max_bytes = mode_bytes
+      for name in images:
+        location.generate_output_folder(name, output_dir)
+        io = location.generate_io_paths(name, input_dir, output_dir)
+        requests, allocations = pool.POOL.requests, pool.POOL.allocations
+
+        start: float = time.perf_counter()
+        try:
+          background.run(io, replace(config, filename=name))
+          edge.detect(io, replace(config, filename=name))
+        except InputRejected as error:  # Eg: a blank image -> not measured
+          logger.error(str(error))
+          continue
+        seconds: float = time.perf_counter() - start
+
+        measurements.append(
+          Measurement(mode, name, pool.POOL.requests - requests, pool.POOL.allocations - allocations, seconds)
+        )
+  finally:
+    pool.POOL.clear()
+    pool.POOL.max_bytes = max_bytes
+  return measurements
+
+
+def summarize(measurements: list[Measurement]) -> str:
+  """
+  Formats per-mode averages side by side: buffers requested and allocated per image, and runtime per image.
+
+  Args:
+      measurements (list[Measurement]): The measurements returned by a benchmark.
+
+  Returns:
+      str: A table with one row per mode.
+  """
+  rows: list[str] = [f"{'Mode':<12} {'Requests/img':>12} {'Allocs/img':>10} {'Allocs (1st)':>12} {'ms/img':>8}"]
+  for mode in dict.fromkeys(measurement.mode for measurement in measurements):
+    own = [measurement for measurement in measurements if measurement.mode == mode]
+    requests: float = sum(measurement.requests for measurement in own) / len(own)
+    allocations: float = sum(measurement.allocations for measurement in own) / len(own)
+    milliseconds: float = sum(measurement.seconds for measurement in own) / len(own) * 1000
+    rows.append(f"{mode:<12} {requests:>12.1f} {allocations:>10.1f} {own[0].allocations:>12} {milliseconds:>8.1f}")
+  return "\n".join(rows)
+
+
+def simplify(input_dir: str, config: Config, threads: tuple[int, ...] = (1, 2, 4, 8), repeat: int = 3) -> list[Scaling]:
+  """
+  Measures contour simplification (`engine.simplify`) on every image of a directory, for every thread count. The
+  contours are traced once per image, with the same preprocessing as `edge.detect`, so only the simplification is
+  timed. Hatch-heavy plans (many contours) benefit the most.
+
+  Args:
+      input_dir (str): The directory containing the images.
+      config (Config): An instance of the Config class containing configuration settings, including
+          `simplify_min_points`.
+      threads (tuple[int, ...], optional): The thread counts to compare. Defaults to (1, 2, 4, 8).
+      repeat (int, optional): The number of runs per thread count; the best is kept. Defaults to 3.
+
+  Returns:
+      list[Scaling]: One measurement per thread count and image.
+  """
+  images = location.list_images(input_dir)
+  logger.info(f"Benchmarking contour simplification on {len(images)} images with {list(threads)} threads")
+
+  kernel = np.ones((3, 3), np.uint8)
+  scalings: list[Scaling] = []
+  for name in images:
+    gray = cv2.imread(f"{input_dir}/{name}", cv2.IMREAD_GRAYSCALE)
+    _, binary = cv2.threshold(gray, config.threshold_value, 255, cv2.THRESH_BINARY)
+    reduced = cv2.dilate(binary, kernel, iterations=config.thickness_reduction_iterations)
+    reduced, _, _ = speck.remove(reduced, config.speck_min_area, config.speck_min_extent)
+    contours, _ = cv2.findContours(
+      cv2.subtract(reduced, cv2.erode(reduced, kernel)), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+    )
+
+    reference = engine.simplify(contours, 1, config.simplify_min_points)
+    for count in threads:
+      seconds: float = float("inf")
+      for _ in range(repeat):
+        start: float = time.perf_counter()
+        simplified = engine.simplify(contours, count, config.simplify_min_points)
+        seconds = min(seconds, time.perf_counter() - start)
+      identical: bool = len(simplified) == len(reference) and all(map(np.array_equal, simplified, reference))
+      scalings.append(Scaling(count, name, len(contours), seconds, identical))
+  return scalings
+
+
+def summarize_scaling(scalings: list[Scaling]) -> str:
+  """
+  Formats per-thread-count totals side by side: contours, runtime, speedup over the first thread count, and
+  whether every result was identical to the single-threaded one.
+
+  Args:
+      scalings (list[Scaling]): The measurements returned by `simplify`.
+
+  Returns:
+      str: A table with one row per thread count.
+  """
+  rows: list[str] = [f"{'Threads':>7} {'Contours':>9} {'ms':>9} {'Speedup':>7} {'Identical':>9}"]
+  baseline: float | None = None
+  for threads in dict.fromkeys(scaling.threads for scaling in scalings):
+    own = [scaling for scaling in scalings if scaling.threads == threads]
+    seconds: float = sum(scaling.seconds for scaling in own)
+    baseline = baseline or seconds
+    identical: bool = all(scaling.identical for scaling in own)
+    contours: int = sum(scaling.contours for scaling in own)
+    rows.append(f"{threads:>7} {contours:>9} {seconds * 1000:>9.1f} {baseline / seconds:>7.2f} {identical!s:>9}")
+  return "\n".join(rows)
@@ -0,0 +1,184 @@
+"""
+This module provides an accuracy-versus-speed evaluation of vertex detection against ground truth.
+
+The corpus is a directory of floorplan images, each with a ground-truth file named `<base>.txt` next to it, in the
+format written by `save.vertices_as_txt` (one `[x, y]` per line). Every configuration is run on every image; the
+merged vertices are matched to the ground truth and scored together with the detection runtime.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `time`: Standard library for time access.
+- `dataclasses`: For the score record and deriving a per-image configuration.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `src.config.config.Config`: Custom class for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.process.edge`: Custom module for vertex detection.
+- `src.process.merge`: Custom module for merging close vertices.
+
+Classes:
+- `Score`: A dataclass representing the evaluation of one configuration on one image.
+
+Functions:
+- `read_vertices(path: str) -> np.ndarray`: Reads a vertex file written by `save.vertices_as_txt`.
+- `match(predicted: np.ndarray, truth: np.ndarray, tolerance: float) -> np.ndarray`: Matches predicted to true vertices.
+- `evaluate(corpus_dir: str, configs: dict[str, Config], tolerance: float, output_dir: str) -> list[Score]`: Scores configurations on a corpus.
+- `summarize(scores: list[Score]) -> str`: Formats per-configuration totals side by side.
+"""
+
+import os
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+from loguru import logger
+
+from src.config import location
+from src.config.config import Config
+from src.process import edge, merge
+
+MATCH_CHUNK_BYTES = 64 * 1024 * 1024  # Memory of the distances computed at once by `match`
+
+
+@dataclass(frozen=True, slots=True)
+class Score:
+  """
+  A dataclass to hold the evaluation of one configuration on one image.
+
+  Attributes:
+      config (str): The name of the configuration.
+      image (str): The filename of the image.
+      predicted (int): The number of predicted (merged) vertices.
+      truth (int): The number of ground-truth vertices.
+      matched (int): The number of predicted vertices matched to a ground-truth vertex.
+      error (float): The sum of the localization errors of the matches, in pixels.
+      seconds (float): The runtime of vertex detection and merging.
+  """
+
+  config: str
+  image: str
+  predicted: int
+  truth: int
+  matched: int
+  error: float
+  seconds: float
+
+
+def read_vertices(path: str) -> np.ndarray:
+  """
+  Reads a vertex file written by `save.vertices_as_txt`.
+
+  Args:
+      path (str): The path to the vertex file.
+
+  Returns:
+      np.ndarray: An (N, 2) float array of vertex coordinates.
+  """
+  with open(path, "r") as file:
+    text: str = file.read().replace("[", " ").replace("]", " ").replace(",", " ")
+  return np.array(text.split(), dtype=np.float64).reshape(-1, 2)
+
+
+def match(predicted: np.ndarray, truth: np.ndarray, tolerance: float) -> np.ndarray:
+  """
+  Matches predicted to true vertices one-to-one: a pair matches when each is the other's nearest neighbor and they
+  are at most `tolerance` apart. Distances are computed for chunks of predicted vertices, so memory stays bounded by
+  `MATCH_CHUNK_BYTES` on dense plans.
+
+  Args:
+      predicted (np.ndarray): An (N, 2) array of predicted vertices.
+      truth (np.ndarray): An (M, 2) array of ground-truth vertices.
+      tolerance (float): The maximum distance of a match, in pixels.
+
+  Returns:
+      np.ndarray: The distances of the matched pairs.
+  """
+  if len(predicted) == 0 or len(truth) == 0:
+    return np.empty(0)
+
+  rows: int = max(1, MATCH_CHUNK_BYTES // (16 * len(truth)))  # Two (rows, M) float64 arrays
+  nearest_truth = np.empty(len(predicted), np.int64)
+  best = np.empty(len(predicted))
+  nearest_predicted = np.zeros(len(truth), np.int64)
+  column_best = np.full(len(truth), np.inf)
+  for start in range(0, len(predicted), rows):
+    chunk = predicted[start : start + rows]
+    dx = chunk[:, 0, None] - truth[None, :, 0]
+    dy = chunk[:, 1, None] - truth[None, :, 1]
+    distances = np.sqrt(dx * dx + dy * dy)  # (rows, M)
+    nearest_truth[start : start + len(chunk)] = distances.argmin(axis=1)
+    best[start : start + len(chunk)] = distances[np.arange(len(chunk)), nearest_truth[start : start + len(chunk)]]
+    # Earlier chunks win ties, like a single argmin over all rows
+    column = distances.argmin(axis=0)
+    column_distances = distances[column, np.arange(len(truth))]
+    closer = column_distances < column_best
+    nearest_predicted[closer] = column[closer] + start
+    column_best[closer] = column_distances[closer]
+
+  mutual = nearest_predicted[nearest_truth] == np.arange(len(predicted))
+  return best[mutual & (best <= tolerance)]
+
+
+def evaluate(corpus_dir: str, configs: dict[str, Config], tolerance: float, output_dir: str) -> list[Score]:
+  """
+  Scores every configuration on every image of a corpus.
+
+  Args:
+      corpus_dir (str): The directory containing images and their `<base>.txt` ground-truth files.
+      configs (dict[str, Config]): The configurations to compare, by name.
+      tolerance (float): The maximum distance of a match, in pixels.
+      output_dir (str): The root directory of the detection overlays (one subfolder per configuration).
+
+  Process:
+      1. Lists the images of the corpus that have a ground-truth file.
+      2. Runs vertex detection and merging with every configuration, timing both.
+      3. Matches the merged vertices to the ground truth.
+
+  Returns:
+      list[Score]: One score per configuration and image.
+  """
+  images = [
+    name
+    for name in location.list_images(corpus_dir)
+    if os.path.exists(os.path.join(corpus_dir, f"{os.path.splitext(name)[0]}.txt"))
+  ]
+  logger.info(f"Evaluating {len(configs)} configurations on {len(images)} annotated images")
+
+  scores: list[Score] = []
+  for name in images:
+    truth = read_vertices(os.path.join(corpus_dir, f"{os.path.splitext(name)[0]}.txt"))
+    for config_name, config in configs.items():
+      config_dir: str = os.path.join(output_dir, config_name)
+      location.generate_output_folder(name, config_dir)
+      io = location.generate_io_paths(name, corpus_dir, config_dir)
+
+      start: float = time.perf_counter()
+      vertices = edge.detect(io, replace(config, filename=name))
+      merged = np.array(merge.close_vertices(io, vertices, epsilon=12), dtype=np.float64).reshape(-1, 2)
+      seconds: float = time.perf_counter() - start
+
+      matches = match(merged, truth, tolerance)
+      scores.append(Score(config_name, name, len(merged), len(truth), len(matches), float(matches.sum()), seconds))
+  return scores
+
+
+def summarize(scores: list[Score]) -> str:
+  """
+  Formats per-configuration totals side by side: precision, recall, mean localization error and runtime.
+
+  Args:
+      scores (list[Score]): The scores returned by `evaluate`.
+
+  Returns:
+      str: A table with one row per configuration.
+  """
+  rows: list[str] = [f"{'Config':<20} {'Precision':>9} {'Recall':>9} {'Error (px)':>10} {'Seconds':>9} {'Images':>6}"]
+  for config in dict.fromkeys(score.config for score in scores):
+    own = [score for score in scores if score.config == config]
+    matched: int = sum(score.matched for score in own)
+    precision: float = matched / max(sum(score.predicted for score in own), 1)
+    recall: float = matched / max(sum(score.truth for score in own), 1)
+    error: float = sum(score.error for score in own) / max(matched, 1)
+    seconds: float = sum(score.seconds for score in own)
+    rows.append(f"{config:<20} {precision:>9.3f} {recall:>9.3f} {error:>10.2f} {seconds:>9.3f} {len(own):>6}")
+  return "\n".join(rows)
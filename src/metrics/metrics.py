@@ -0,0 +1,303 @@
+"""
+This module provides process-wide throughput metrics and exports them in the OpenMetrics text format.
+
+Every process (main process, `worker` processes, pool processes of `watch` and multi-page runs) keeps its own registry
+and, when a metrics directory is configured, writes it to `<metrics_dir>/<host>-<pid>.prom` after every image. All
+samples carry a `worker` label, so the files can be collected as-is (eg: node_exporter textfile collector), or merged
+and served by `serve`.
+
+The metrics directory is passed through the `FLOORPLAN_METRICS_DIR` environment variable, which is inherited by
+child processes regardless of the multiprocessing start method.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `socket`: Standard library for the host name.
+- `threading`: Standard library for the registry lock and the HTTP server thread.
+- `time`: Standard library for time access.
+- `collections`: Standard library for bounded sample windows.
+- `contextlib`: Standard library for the timer context manager.
+- `http.server`: Standard library for the scrape endpoint.
+- `src.utility.save`: Custom module for atomic file writes.
+
+Constants:
+- `ENVIRONMENT`: Environment variable holding the metrics directory.
+- `FAMILIES`: Type and help text of every metric family.
+
+Functions:
+- `configure(metrics_dir: str) -> None`: Enables exporting for this process and its children.
+- `inc(name: str, amount: float = 1, **labels: str) -> None`: Increments a counter.
+- `observe(name: str, value: float, **labels: str) -> None`: Records a sample of a summary.
+- `timer(name: str, **labels: str) -> Iterator[None]`: Records the duration of a block in a summary.
+- `render() -> str`: Renders the registry of this process.
+- `export() -> None`: Writes the registry of this process to the metrics directory.
+- `collect(metrics_dir: str) -> str`: Merges the exported registries of every process.
+- `serve(metrics_dir: str, port: int) -> ThreadingHTTPServer`: Serves the merged registries over HTTP.
+- `_reset_after_fork() -> None`: Clears a registry inherited from a forked parent process.
+- `_worker() -> str`: Returns the identifier of this process.
+- `_labels(labels: dict[str, str]) -> str`: Formats a label set.
+- `_quantile(samples: list[float], q: float) -> float`: Computes a quantile of sorted samples.
+"""
+
+import os
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utility import save
+
+ENVIRONMENT = "FLOORPLAN_METRICS_DIR"
+
+# Metric families
+IMAGES = "floorplan_images"
+IMAGES_PER_SECOND = "floorplan_images_per_second"
+STAGE_SECONDS = "floorplan_stage_seconds"
+VERTICES = "floorplan_vertices"
+BYTES_WRITTEN = "floorplan_bytes_written"
+TOOL_SECONDS = "floorplan_tool_seconds"
+TOOL_FAILURES = "floorplan_tool_failures"
+SVG_BYTES = "floorplan_svg_bytes"
+
+FAMILIES: dict[str, tuple[str, str]] = {
+  IMAGES: ("counter", "Images processed, by status (ok, failed, rejected)."),
+  IMAGES_PER_SECOND: ("gauge", "Images processed per second since the process started."),
+  STAGE_SECONDS: ("summary", "Latency of each pipeline stage."),
+  VERTICES: ("summary", "Vertices per image, before (detected) and after (merged) merging close vertices."),
+  BYTES_WRITTEN: ("counter", "Bytes of outputs written."),
+  TOOL_SECONDS: ("summary", "Duration of external tool runs."),
+  TOOL_FAILURES: ("counter", "Failed external tool runs."),
+  SVG_BYTES: ("summary", "Size of the traced SVG, before (traced) and after (optimized) optimization."),
+}
+
+QUANTILES = (0.5, 0.9, 0.99)
+WINDOW = 1024  # Most recent samples used for quantiles
+
+_lock = threading.Lock()
+_pid: int = os.getpid()
+_start: float = time.time()
+_counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = defaultdict(float)
+_summaries: dict[tuple[str, tuple[tuple[str, str], ...]], tuple[deque, list[float]]] = {}
+
+
+def configure(metrics_dir: str) -> None:
+  """
+  Enables exporting for this process and every child process started afterwards.
+
+  Args:
+      metrics_dir (str): The directory receiving one `.prom` file per process.
+  """
+  os.makedirs(metrics_dir, exist_ok=True)
+  os.environ[ENVIRONMENT] = metrics_dir
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+  """
+  Increments a counter.
+
+  Args:
+      name (str): The metric family, one of `FAMILIES`.
+      amount (float, optional): The increment. Defaults to 1.
+      **labels (str): The labels of the series.
+  """
+  with _lock:
+    _reset_after_fork()
+    _counters[(name, tuple(sorted(labels.items())))] += amount
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+  """
+  Records a sample of a summary.
+
+  Args:
+      name (str): The metric family, one of `FAMILIES`.
+      value (float): The sample.
+      **labels (str): The labels of the series.
+  """
+  key = (name, tuple(sorted(labels.items())))
+  with _lock:
+    _reset_after_fork()
+    window, totals = _summaries.setdefault(key, (deque(maxlen=WINDOW), [0.0, 0.0]))
+    window.append(value)
+    totals[0] += value
+    totals[1] += 1
+
+
+@contextmanager
+def timer(name: str, **labels: str) -> Iterator[None]:
+  """
+  Records the duration of a block in a summary, including blocks that raise.
+
+  Args:
+      name (str): The metric family, one of `FAMILIES`.
+      **labels (str): The labels of the series.
+  """
+  start: float = time.perf_counter()
+  try:
+    yield
+  finally:
+    observe(name, time.perf_counter() - start, **labels)
+
+
+def render() -> str:
+  """
+  Renders the registry of this process in the OpenMetrics text format.
+
+  Returns:
+      str: The rendered registry, terminated by `# EOF`.
+  """
+  worker = (("worker", _worker()),)
+  samples: dict[str, list[str]] = defaultdict(list)
+  with _lock:
+    _reset_after_fork()
+    for (name, labels), value in _counters.items():
+      samples[name].append(f"{name}_total{_labels(dict(labels + worker))} {value}")
+    for (name, labels), (window, (total, count)) in _summaries.items():
+      ordered = sorted(window)
+      for q in QUANTILES:
+        quantile = (("quantile", str(q)),)
+        samples[name].append(f"{name}{_labels(dict(labels + worker + quantile))} {_quantile(ordered, q)}")
+      samples[name].append(f"{name}_sum{_labels(dict(labels + worker))} {total}")
+      samples[name].append(f"{name}_count{_labels(dict(labels + worker))} {count:.0f}")
+    images: float = sum(value for (name, _), value in _counters.items() if name == IMAGES)
+  samples[IMAGES_PER_SECOND].append(f"{IMAGES_PER_SECOND}{_labels(dict(worker))} {images / (time.time() - _start)}")
+
+  lines: list[str] = []
+  for name, (kind, help) in FAMILIES.items():
+    if name in samples:
+      lines += [f"# TYPE {name} {kind}", f"# HELP {name} {help}", *samples[name]]
+  lines.append("# EOF")
+  return "\n".join(lines) + "\n"
+
+
+def export() -> None:
+  """
+  Writes the registry of this process to `<metrics_dir>/<host>-<pid>.prom`. Does nothing if no directory is configured.
+  """
+  metrics_dir: str | None = os.environ.get(ENVIRONMENT)
+  if metrics_dir:
+    save.write_atomic(os.path.join(metrics_dir, f"{_worker()}.prom"), render())
+
+
+def collect(metrics_dir: str) -> str:
+  """
+  Merges the exported registries of every process into one OpenMetrics exposition.
+
+  Args:
+      metrics_dir (str): The directory containing one `.prom` file per process.
+
+  Returns:
+      str: The merged exposition, terminated by `# EOF`.
+  """
+  headers: dict[str, list[str]] = {}
+  samples: dict[str, list[str]] = defaultdict(list)
+  for filename in sorted(os.listdir(metrics_dir)):
+    if not filename.endswith(".prom"):
+      continue
+    with open(os.path.join(metrics_dir, filename), "r") as file:
+      family: str = ""
+      for line in file.read().splitlines():
+        if line.startswith("# TYPE "):
+          family = line.split()[2]
+          headers.setdefault(family, [])
+        if line.startswith("# EOF"):
+          break
+        if line.startswith("#"):
+          if len(headers[family]) < 2:
+            headers[family].append(line)
+          continue
+        samples[family].append(line)
+
+  lines: list[str] = []
+  for family, header in headers.items():
+    lines += [*header, *samples[family]]
+  lines.append("# EOF")
+  return "\n".join(lines) + "\n"
+
+
+def serve(metrics_dir: str, port: int) -> ThreadingHTTPServer:
+  """
+  Serves the merged registries of every process on `http://localhost:<port>/metrics` from a background thread.
+
+  Args:
+      metrics_dir (str): The directory containing one `.prom` file per process.
+      port (int): The port to listen on.
+
+  Returns:
+      ThreadingHTTPServer: The running server. Call `shutdown()` to stop it.
+  """
+
+  class Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+      export()  # Include the latest state of the serving process
+      body: bytes = collect(metrics_dir).encode()
+      self.send_response(200)
+      self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+      pass  # Keep scrapes out of the console
+
+  server = ThreadingHTTPServer(("localhost", port), Handler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server
+
+
+def _reset_after_fork() -> None:
+  """
+  Clears a registry inherited from a forked parent process, so that samples are not counted twice. Call with the lock.
+  """
+  global _pid, _start
+  if os.getpid() != _pid:
+    _pid, _start = os.getpid(), time.time()
+    _counters.clear()
+    _summaries.clear()
+
+
+def _worker() -> str:
+  """
+  Returns the identifier of this process, used as the `worker` label and as the export filename.
+
+  Returns:
+      str: The identifier formatted as `<hostname>-<pid>`.
+  """
+  return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _labels(labels: dict[str, str]) -> str:
+  """
+  Formats a label set.
+
+  Args:
+      labels (dict[str, str]): The labels.
+
+  Returns:
+      str: The labels formatted as `{key="value",...}`, or an empty string.
+  """
+  if not labels:
+    return ""
+  pairs: list[str] = []
+  for key, value in labels.items():
+    value = value.replace("\\", "\\\\").replace('"', '\\"')  # Escape as required by the format
+    pairs.append(f'{key}="{value}"')
+  return "{" + ",".join(pairs) + "}"
+
+
+def _quantile(samples: list[float], q: float) -> float:
+  """
+  Computes a quantile of sorted samples (nearest rank).
+
+  Args:
+      samples (list[float]): The samples, sorted ascending.
+      q (float): The quantile, between 0 and 1.
+
+  Returns:
+      float: The quantile, or NaN if there are no samples.
+  """
+  if not samples:
+    return float("nan")
+  return samples[min(len(samples) - 1, int(q * len(samples)))]
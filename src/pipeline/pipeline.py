@@ -0,0 +1,183 @@
+"""
+This module provides the per-image processing pipeline shared by the single-file entry point and the batch runners.
+
+Dependencies:
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `src.blender.blender`: Handles Blender script generation.
+- `src.check.probe`: Handles early rejection of unusable inputs.
+- `src.clean.background`: Handles background cleaning.
+- `src.clean.crop`: Handles image cropping.
+- `src.documentation.typst`: Handles Typst document generation.
+- `src.postprocess.svg`: Handles SVG tracing.
+- `src.postprocess.optimize`: Handles SVG optimization.
+- `src.process.edge`: Handles edge detection and vertex extraction.
+- `src.process.merge`: Handles merging of close vertices.
+- `src.utility.save`: Handles saving of vertices to a text file.
+- `src.pipeline.scheduler`: Runs the steps as a dependency graph on a thread pool.
+- `src.utility.pool`: Module providing reusable image buffers.
+- `src.metrics.metrics`: Records stage latencies, vertex counts and bytes written.
+- `src.config.config.Config`: Custom class for configuration settings.
+- `src.config.location.IO`: Custom class for input/output paths.
+
+Functions:
+- `run(io: IO, config: Config, version: str, published: IO | None = None, data: np.ndarray | None = None, image: np.ndarray | None = None) -> None`: Runs every processing step for one image.
+- `_decode(io: IO, data: np.ndarray | None) -> np.ndarray`: Decodes the input image.
+- `_snapshot(path: str) -> dict[str, tuple[int, int]]`: Returns the size and modification time of the files in a folder.
+- `_written_bytes(path: str, before: dict[str, tuple[int, int]]) -> int`: Returns the size of the files written since a snapshot.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+import src.clean.background
+import src.clean.crop
+import src.postprocess.optimize
+import src.postprocess.svg
+from src.blender import blender
+from src.check import probe
+from src.check.probe import InputRejected
+from src.config.config import Config
+from src.config.location import IO
+from src.documentation import typst
+from src.metrics import metrics
+from src.pipeline import scheduler
+from src.pipeline.scheduler import Stage
+from src.process import edge, merge
+from src.utility import pool, save
+
+
+def run(
+  io: IO,
+  config: Config,
+  version: str,
+  published: IO | None = None,
+  data: np.ndarray | None = None,
+  image: np.ndarray | None = None,
+) -> None:
+  """
+  Runs every processing step for one image. Output folders must already exist.
+
+  Args:
+      io (IO): An instance of the IO class containing input/output paths.
+      config (Config): An instance of the Config class containing configuration settings.
+      version (str): The version of the application, used in the Typst document.
+      published (IO | None, optional): The paths the outputs will be moved to after the run, if `io` points at a
+          staging area. Used for paths that are embedded into generated scripts. Defaults to None.
+      data (np.ndarray | None, optional): The encoded input image, if it is not a file (eg: an archive member). It is
+          decoded with `cv2.imdecode`, and `io.input` is only used as its name. Defaults to None (reads `io.input`).
+      image (np.ndarray | None, optional): The already-decoded input image (eg: prefetched by `Prefetcher`), used
+          instead of decoding `io.input` or `data`. Defaults to None.
+
+  Process:
+      0. Rejects unusable inputs from a thumbnail before any other work (see `probe.check`).
+      1. Reads the input image once, then declares the steps as a dependency graph, with two independent branches:
+         - Detects vertices, merges close vertices and saves them to a text file.
+         - Runs background cleaning and image cropping, traces the cleaned image to an optimized SVG and generates a
+           Blender action script.
+      2. Runs the graph on `config.stage_threads` threads, then generates a Typst document from both branches.
+      3. Records metrics for the run and exports them if a metrics directory is configured. Bytes written only count
+         the files of the output folder created or modified by a successful run.
+
+  Raises:
+      InputRejected: If the input is unusable (unreadable, blank or degenerate with this configuration).
+  """
+  stages: list[Stage] = [
+    # Vertex detection
+    Stage("read", lambda: image if image is not None else _decode(io, data)),
+    Stage("detect", lambda image: edge.detect(io, config, image=image), after=("read",)),
+    Stage(
+      "merge",
+      lambda vertices, image: merge.close_vertices(io, vertices, epsilon=12, image=image),
+      after=("detect", "read"),
+    ),
+    Stage("save", lambda merged: save.vertices_as_txt(io.coordinates, merged), after=("merge",)),
+    # Cleanup and SVG tracing
+    Stage("background", lambda image: src.clean.background.run(io, config, image=image), after=("read",)),
+    Stage("crop", lambda _: src.clean.crop.padding(io), after=("background",)),
+    Stage("trace", lambda _: src.postprocess.svg.trace(io, config), after=("crop",)),
+    Stage("optimize", lambda _: src.postprocess.optimize.optimize(io, config), after=("trace",)),
+    # Generate Blender action script
+    Stage(
+      "blender",
+      lambda _: blender.generate_bpy_script(io, config, svg_path=published.svg if published else None),
+      after=("optimize",),
+    ),
+    # Generate Typst document, which embeds the outputs of both branches
+    Stage(
+      "typst",
+      lambda image, *_: typst.generate_typst_document(
+        io,
+        config,
+        version,
+        dimensions=(image.shape[1], image.shape[0]),
+        image=None if data is None else image,
+        published=published,
+      ),
+      after=("read", "save", "blender"),
+    ),
+  ]
+
+  # Full-size buffers are reused between images of the same size (see `pool.BufferPool`)
+  pool.POOL.max_bytes = config.buffer_pool_mb * 1024 * 1024
+
+  folder: str = os.path.dirname(io.blender_script)
+  before: dict[str, tuple[int, int]] = _snapshot(folder)
+  status: str = "failed"
+  try:
+    with metrics.timer(metrics.STAGE_SECONDS, stage="probe"):
+      probe.check(io.input, config, data=data, image=image)
+    results = scheduler.execute(stages, config.stage_threads)
+    metrics.observe(metrics.VERTICES, len(results["detect"]), stage="detected")
+    metrics.observe(metrics.VERTICES, len(results["merge"]), stage="merged")
+    status = "ok"
+  except InputRejected:
+    status = "rejected"
+    raise
+  finally:
+    metrics.inc(metrics.IMAGES, status=status)
+    if status == "ok":
+      metrics.inc(metrics.BYTES_WRITTEN, _written_bytes(folder, before))
+    metrics.export()
+
+
+def _decode(io: IO, data: np.ndarray | None) -> np.ndarray:
+  """
+  Decodes the input image from `data`, or reads `io.input` if there is no data.
+  """
+  return cv2.imread(io.input) if data is None else cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def _snapshot(path: str) -> dict[str, tuple[int, int]]:
+  """
+  Returns the size and modification time of the files in a folder, including subfolders.
+
+  Args:
+      path (str): The path to the folder.
+
+  Returns:
+      dict[str, tuple[int, int]]: The size in bytes and modification time in nanoseconds, by file path.
+  """
+  files: dict[str, tuple[int, int]] = {}
+  for root, _, names in os.walk(path):
+    for name in names:
+      stat = os.stat(os.path.join(root, name))
+      files[os.path.join(root, name)] = (stat.st_size, stat.st_mtime_ns)
+  return files
+
+
+def _written_bytes(path: str, before: dict[str, tuple[int, int]]) -> int:
+  """
+  Returns the total size of the files of a folder created or modified since a snapshot. Files left over from earlier
+  runs are not counted.
+
+  Args:
+      path (str): The path to the folder.
+      before (dict[str, tuple[int, int]]): The snapshot of the folder (see `_snapshot`).
+
+  Returns:
+      int: The total size in bytes.
+  """
+  return sum(size for file, (size, mtime) in _snapshot(path).items() if before.get(file) != (size, mtime))
@@ -0,0 +1,158 @@
+"""
+This module provides a scheduler that runs pipeline stages declared as a dependency graph on a thread pool.
+
+A stage starts as soon as all the stages it depends on have finished, and receives their results as arguments. The
+heavy stages spend their time in OpenCV and external tools, which release the GIL, so independent branches overlap and
+the latency of a run drops to its critical path.
+
+Dependencies:
+- `time`: Standard library for time access.
+- `collections.abc`: Standard library for the callable type.
+- `concurrent.futures`: Standard library for the thread pool.
+- `dataclasses`: For the stage declaration.
+- `typing`: Standard library for type hints.
+- `loguru.logger`: For logging information.
+- `src.metrics.metrics`: Records the latency of every stage.
+
+Classes:
+- `Stage`: A dataclass representing one step of the pipeline and the steps it depends on.
+
+Functions:
+- `execute(stages: list[Stage], threads: int) -> dict[str, Any]`: Runs stages in dependency order on a thread pool.
+- `_order(stages: list[Stage]) -> list[Stage]`: Sorts stages topologically and validates the graph.
+- `_timed(stage: Stage, arguments: list[Any]) -> tuple[Any, float]`: Runs a stage and measures its duration.
+"""
+
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from src.metrics import metrics
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+  """
+  A dataclass to hold one step of the pipeline.
+
+  Attributes:
+      name (str): The unique name of the stage, also used as the `stage` label of the latency metric.
+      run (Callable[..., Any]): The function of the stage. Called with the results of `after`, in order.
+      after (tuple[str, ...]): The names of the stages that must finish before this one starts. Defaults to none.
+  """
+
+  name: str
+  run: Callable[..., Any]
+  after: tuple[str, ...] = ()
+
+
+def execute(stages: list[Stage], threads: int) -> dict[str, Any]:
+  """
+  Runs stages in dependency order on a thread pool.
+
+  Args:
+      stages (list[Stage]): The stages to run. Ready stages are started in the order they are declared.
+      threads (int): The number of threads. 1 runs the stages sequentially in topological order.
+
+  Process:
+      1. Validates the graph (unique names, known dependencies, no cycles).
+      2. Starts every stage whose dependencies have finished, and waits for the next stage to finish.
+      3. On failure, starts no further stages, waits for the running ones and re-raises the first exception.
+      4. Logs the wall time next to the critical path and the sequential time.
+
+  Returns:
+      dict[str, Any]: The result of every stage, by name.
+
+  Raises:
+      ValueError: If the graph is invalid.
+  """
+  pending: list[Stage] = _order(stages)
+  results: dict[str, Any] = {}
+  durations: dict[str, float] = {}
+  finish: dict[str, float] = {}  # Finish time of each stage on an unlimited number of threads
+  running: dict[Future, Stage] = {}
+  error: BaseException | None = None
+  start: float = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=max(threads, 1), thread_name_prefix="stage") as pool:
+    while pending or running:
+      if error is None:
+        for stage in [stage for stage in pending if all(name in results for name in stage.after)]:
+          pending.remove(stage)
+          running[pool.submit(_timed, stage, [results[name] for name in stage.after])] = stage
+      if not running:
+        break
+
+      done, _ = wait(running, return_when=FIRST_COMPLETED)
+      for future in done:
+        stage = running.pop(future)
+        try:
+          results[stage.name], durations[stage.name] = future.result()
+        except Exception as exception:  # noqa: BLE001 (re-raised below, KeyboardInterrupt propagates)
+          error = error or exception
+          continue
+        finish[stage.name] = durations[stage.name] + max((finish[name] for name in stage.after), default=0.0)
+
+  if error is not None:
+    raise error
+
+  logger.info(
+    f"Ran {len(stages)} stages in {time.perf_counter() - start:.3f} s on {max(threads, 1)} threads "
+    f"(critical path {max(finish.values(), default=0.0):.3f} s, sequential {sum(durations.values()):.3f} s)"
+  )
+  return results
+
+
+def _order(stages: list[Stage]) -> list[Stage]:
+  """
+  Sorts stages topologically, keeping the declaration order among independent stages, and validates the graph.
+
+  Args:
+      stages (list[Stage]): The stages to sort.
+
+  Returns:
+      list[Stage]: The sorted stages.
+
+  Raises:
+      ValueError: If a name is declared twice, a dependency is unknown, or the graph has a cycle.
+  """
+  names: set[str] = {stage.name for stage in stages}
+  if len(names) != len(stages):
+    raise ValueError("Stage names must be unique")
+  for stage in stages:
+    unknown = set(stage.after) - names
+    if unknown:
+      raise ValueError(f"Stage `{stage.name}` depends on unknown stages {sorted(unknown)}")
+
+  ordered: list[Stage] = []
+  placed: set[str] = set()
+  remaining: list[Stage] = list(stages)
+  while remaining:
+    ready = [stage for stage in remaining if placed.issuperset(stage.after)]
+    if not ready:
+      raise ValueError(f"Stages {[stage.name for stage in remaining]} form a dependency cycle")
+    for stage in ready:
+      remaining.remove(stage)
+      placed.add(stage.name)
+    ordered += ready
+  return ordered
+
+
+def _timed(stage: Stage, arguments: list[Any]) -> tuple[Any, float]:
+  """
+  Runs a stage, records its latency and measures its duration.
+
+  Args:
+      stage (Stage): The stage to run.
+      arguments (list[Any]): The results of the stages it depends on.
+
+  Returns:
+      tuple[Any, float]: The result of the stage and its duration in seconds.
+  """
+  start: float = time.perf_counter()
+  with metrics.timer(metrics.STAGE_SECONDS, stage=stage.name):
+    result = stage.run(*arguments)
+  return result, time.perf_counter() - start
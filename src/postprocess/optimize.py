@@ -0,0 +1,293 @@
+"""
+This module provides functionality for optimizing the traced SVG file before it is imported into Blender and
+embedded into the Typst document.
+
+Path data is converted to absolute coordinates, near-straight curves and near-collinear lines are simplified within a
+tolerance, coordinates are quantized, and the path is written back with compact relative commands. Metadata, default
+attributes and whitespace between elements are removed.
+
+Dependencies:
+- `math`: Standard library for mathematical functions.
+- `os`: Standard library for interacting with the operating system.
+- `re`: Standard library for regular expressions.
+- `xml.etree.ElementTree`: Standard library for parsing and writing the SVG file.
+- `loguru.logger`: For logging information.
+- `src.config.config`: Custom module for configuration settings and resolving the Potrace executable.
+- `src.config.location.IO`: Custom class for input/output paths.
+- `src.metrics.metrics`: Records the SVG size before and after optimization.
+
+Functions:
+- `optimize(io: IO, config: Config) -> None`: Optimizes the SVG file in place and reports the size reduction.
+- `optimize_svg(svg: str, precision: int, tolerance: float) -> tuple[str, int, int]`: Optimizes SVG source.
+- `optimize_path(d: str, precision: int, tolerance: float) -> str | None`: Optimizes the data of one path.
+- `_parse_path(d: str) -> list[tuple[tuple[float, float], list[tuple]]] | None`: Parses path data into absolute subpaths.
+- `_simplify(start: tuple[float, float], segments: list[tuple], tolerance: float) -> list[tuple]`: Simplifies a subpath.
+- `_distance(point, a, b) -> float`: Returns the distance of a point to the segment `a`-`b`.
+- `_format(values: list[float], precision: int, leading: bool = False) -> str`: Formats numbers with minimal separators.
+"""
+
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from loguru import logger
+
+from src.config.config import Config, potrace_executable
+from src.config.location import IO
+from src.metrics import metrics
+
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+TOKENS = re.compile(r"[MmLlHhVvCcZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[A-Za-z]")
+REMOVED_ATTRIBUTES = {"version", "preserveAspectRatio"}
+DEFAULT_ATTRIBUTES = {("fill", "#000000"), ("fill", "black"), ("stroke", "none")}
+
+ET.register_namespace("", SVG_NAMESPACE)
+
+
+def optimize(io: IO, config: Config) -> None:
+  """
+  Optimizes the SVG file in place and reports the size reduction.
+
+  Args:
+      io (IO): An instance of the IO class containing input/output paths.
+      config (Config): An instance of the Config class containing configuration settings.
+
+  Process:
+      1. Reads the SVG file traced by Potrace. Does nothing if Potrace is not installed or optimization is disabled.
+      2. Optimizes the path data and strips metadata, default attributes and whitespace.
+      3. Overwrites the SVG file if the result is smaller, records both sizes and logs the size and path token
+         reduction. The effect on Blender import and Typst compilation shows in the `blender`/`typst` stage and tool
+         latencies.
+  """
+  # The raster fallback of `trace` is already minimal, and its coordinates are pixels rather than Potrace units
+  if not config.svg_optimize or potrace_executable(config) is None or not os.path.exists(io.svg):
+    return
+
+  with open(io.svg, "r") as file:
+    source: str = file.read()
+  optimized, tokens_before, tokens_after = optimize_svg(source, config.svg_precision, config.svg_tolerance)
+  before, after = len(source.encode()), len(optimized.encode())
+  if after < before:
+    with open(io.svg, "w") as file:
+      file.write(optimized)
+
+  metrics.observe(metrics.SVG_BYTES, before, stage="traced")
+  metrics.observe(metrics.SVG_BYTES, min(before, after), stage="optimized")
+  logger.info(
+    f"Optimized SVG from {before / 1024:.1f} kB to {min(before, after) / 1024:.1f} kB "
+    f"({max(0, 1 - after / max(before, 1)):.0%} smaller), {tokens_before} to {tokens_after} path tokens"
+  )
+
+
+def optimize_svg(svg: str, precision: int, tolerance: float) -> tuple[str, int, int]:
+  """
+  Optimizes SVG source.
+
+  Args:
+      svg (str): The SVG source.
+      precision (int): The number of decimals kept in path coordinates (negative values round to tens, hundreds...).
+      tolerance (float): The maximum deviation of a simplified segment, in path units.
+
+  Returns:
+      tuple[str, int, int]: The optimized SVG source, and the number of path tokens (commands and numbers) before and after.
+  """
+  root = ET.fromstring(svg)
+  before: int = 0
+  after: int = 0
+  for parent in root.iter():
+    for child in list(parent):
+      if child.tag in (f"{{{SVG_NAMESPACE}}}metadata", f"{{{SVG_NAMESPACE}}}title", f"{{{SVG_NAMESPACE}}}desc"):
+        parent.remove(child)
+
+  for element in root.iter():
+    element.text = element.text.strip() if element.text and element.text.strip() else None
+    element.tail = None
+    for key, value in list(element.attrib.items()):
+      if key in REMOVED_ATTRIBUTES or (key, value) in DEFAULT_ATTRIBUTES:
+        del element.attrib[key]
+    if element.tag == f"{{{SVG_NAMESPACE}}}path" and "d" in element.attrib:
+      before += len(TOKENS.findall(element.attrib["d"]))
+      optimized = optimize_path(element.attrib["d"], precision, tolerance)
+      if optimized is not None:
+        element.attrib["d"] = optimized
+      after += len(TOKENS.findall(element.attrib["d"]))
+
+  return ET.tostring(root, encoding="unicode"), before, after
+
+
+def optimize_path(d: str, precision: int, tolerance: float) -> str | None:
+  """
+  Optimizes the data of one path: simplification, quantization and compact relative commands.
+
+  Args:
+      d (str): The path data.
+      precision (int): The number of decimals kept in coordinates.
+      tolerance (float): The maximum deviation of a simplified segment, in path units.
+
+  Returns:
+      str | None: The optimized path data, or None if the path uses unsupported commands (arcs, quadratic curves).
+  """
+  subpaths = _parse_path(d)
+  if subpaths is None:
+    return None
+
+  parts: list[str] = []
+  for start, segments in subpaths:
+    segments = _simplify(start, segments, tolerance)
+    # Relative offsets are taken between quantized absolute points, so rounding errors do not accumulate
+    cx, cy = round(start[0], precision), round(start[1], precision)
+    parts.append("M" + _format([cx, cy], precision))
+    command: str = ""
+    for segment in segments:
+      points = [(round(x, precision), round(y, precision)) for x, y in segment[1:]]
+      if segment[0] == "L" and points[-1] == (cx, cy):
+        continue  # Collapsed by quantization
+      relative = [value for x, y in points for value in (x - cx, y - cy)]
+      letter: str = "l" if segment[0] == "L" else "c"
+      parts.append(("" if letter == command else letter) + _format(relative, precision, leading=letter == command))
+      command = letter
+      cx, cy = points[-1]
+    parts.append("z")
+  return "".join(parts)
+
+
+def _parse_path(d: str) -> list[tuple[tuple[float, float], list[tuple]]] | None:
+  """
+  Parses path data into closed subpaths of absolute line (`L`) and cubic (`C`) segments.
+
+  Args:
+      d (str): The path data.
+
+  Returns:
+      list[tuple[tuple[float, float], list[tuple]]] | None: The start point and segments of every subpath, or None
+      if the path uses commands other than M, L, H, V, C and Z.
+  """
+  tokens: list[str] = TOKENS.findall(d)
+  subpaths: list[tuple[tuple[float, float], list[tuple]]] = []
+  x, y = 0.0, 0.0
+  start = (0.0, 0.0)
+  segments: list[tuple] = []
+  command: str = ""
+  i: int = 0
+  while i < len(tokens):
+    if tokens[i].isalpha():
+      command = tokens[i]
+      i += 1
+      if command in "Zz":
+        subpaths.append((start, segments))
+        segments = []
+        x, y = start
+        continue
+      if command not in "MmLlHhVvCc":
+        return None
+    relative: bool = command.islower()
+    if command in "Mm":
+      if segments:
+        subpaths.append((start, segments))  # Implicitly open subpath
+        segments = []
+      x, y = float(tokens[i]) + (x if relative else 0), float(tokens[i + 1]) + (y if relative else 0)
+      start = (x, y)
+      command = "l" if relative else "L"  # Further pairs are implicit lines
+      i += 2
+    elif command in "LlHhVv":
+      if command in "Ll":
+        x, y = float(tokens[i]) + (x if relative else 0), float(tokens[i + 1]) + (y if relative else 0)
+        i += 2
+      elif command in "Hh":
+        x = float(tokens[i]) + (x if relative else 0)
+        i += 1
+      else:
+        y = float(tokens[i]) + (y if relative else 0)
+        i += 1
+      segments.append(("L", (x, y)))
+    else:
+      values = [float(token) for token in tokens[i : i + 6]]
+      if relative:
+        values = [value + (x if k % 2 == 0 else y) for k, value in enumerate(values)]
+      segments.append(("C", tuple(values[0:2]), tuple(values[2:4]), tuple(values[4:6])))
+      x, y = values[4], values[5]
+      i += 6
+  if segments:
+    subpaths.append((start, segments))
+  return subpaths
+
+
+def _simplify(start: tuple[float, float], segments: list[tuple], tolerance: float) -> list[tuple]:
+  """
+  Simplifies a subpath: curves whose control points lie within `tolerance` of their chord become lines, and
+  consecutive lines are merged while every dropped point lies within `tolerance` of the merged line.
+
+  Args:
+      start (tuple[float, float]): The start point of the subpath.
+      segments (list[tuple]): The absolute segments of the subpath.
+      tolerance (float): The maximum deviation, in path units.
+
+  Returns:
+      list[tuple]: The simplified segments.
+  """
+  if tolerance <= 0:
+    return segments
+
+  simplified: list[tuple] = []
+  anchor = start  # Start of the line being extended
+  dropped: list[tuple[float, float]] = []  # Points merged into the line being extended
+  previous = start
+  for segment in segments:
+    end = segment[-1]
+    if segment[0] == "C" and max(_distance(point, previous, end) for point in segment[1:3]) <= tolerance:
+      segment = ("L", end)  # Flat curve
+
+    if segment[0] == "L" and simplified and simplified[-1][0] == "L":
+      candidate = [*dropped, simplified[-1][1]]
+      if all(_distance(point, anchor, end) <= tolerance for point in candidate):
+        simplified[-1] = segment
+        dropped = candidate
+        previous = end
+        continue
+
+    anchor, dropped = previous, []
+    simplified.append(segment)
+    previous = end
+  return simplified
+
+
+def _distance(point, a, b) -> float:
+  """
+  Returns the distance of a point to the segment `a`-`b`.
+
+  Args:
+      point (tuple[float, float]): The point.
+      a (tuple[float, float]): The start of the segment.
+      b (tuple[float, float]): The end of the segment.
+
+  Returns:
+      float: The Euclidean distance.
+  """
+  px, py = point[0] - a[0], point[1] - a[1]
+  dx, dy = b[0] - a[0], b[1] - a[1]
+  length = dx * dx + dy * dy
+  t = 0.0 if length == 0 else min(1.0, max(0.0, (px * dx + py * dy) / length))
+  return math.hypot(px - t * dx, py - t * dy)
+
+
+def _format(values: list[float], precision: int, leading: bool = False) -> str:
+  """
+  Formats numbers with minimal separators: no trailing zeros, and no space before negative numbers.
+
+  Args:
+      values (list[float]): The numbers.
+      precision (int): The number of decimals kept.
+      leading (bool, optional): If True, a separator is needed before the first number (implicit command repetition).
+          Defaults to False.
+
+  Returns:
+      str: The formatted numbers.
+  """
+  if precision > 0:
+    numbers = [f"{value:.{precision}f}".rstrip("0").rstrip(".") for value in values]
+    numbers = ["0" if number == "-0" else number for number in numbers]
+  else:
+    numbers = [str(int(value)) for value in values]
+  text: str = " ".join(numbers).replace(" -", "-")
+  return " " + text if leading and not text.startswith("-") else text
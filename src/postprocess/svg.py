@@ -1,12 +1,14 @@
 """
 This module provides functionality for tracing a cleaned background image and saving it as an SVG file.
-It uses the Potrace executable to perform the tracing.
+It uses the Potrace executable to perform the tracing, and falls back to a raster run-length SVG when Potrace is not installed.
 
 Dependencies:
 - `subprocess`: Standard library for spawning new processes and connecting to their input/output/error pipes.
 - `loguru.logger`: For logging information.
-- `src.config.config.Config`: Custom class for configuration settings.
+- `src.config.config`: Custom module for configuration settings and resolving the Potrace executable.
 - `src.config.location.IO`: Custom class for input/output paths.
+- `src.process.svg.generate_wall_svg`: Raster fallback used when Potrace is not installed.
+- `src.metrics.metrics`: Records the duration and failures of Potrace runs.
 
 Functions:
 - `trace(io: IO, config: Config) -> None`: Traces a cleaned background image and saves it as an SVG file.
@@ -14,8 +16,10 @@ Functions:
 
 import subprocess
 from loguru import logger
-from src.config.config import Config
+from src.config.config import Config, potrace_executable
 from src.config.location import IO
+from src.metrics import metrics
+from src.process.svg import generate_wall_svg
 
 
 def trace(io: IO, config: Config) -> None:
@@ -28,7 +32,20 @@ def trace(io: IO, config: Config) -> None:
 
   Process:
       1. Runs the Potrace executable with the given cropped image to generate an SVG file.
-      2. Logs the completion of the tracing process.
+         If Potrace is not installed, generates a run-length raster SVG instead.
+      2. Records the duration of the Potrace run, and counts it as failed on a non-zero exit code.
+      3. Logs the completion of the tracing process.
   """
-  subprocess.run([config.potrace_path, io.cropped, "-b", "svg"], capture_output=True)
+  potrace: str | None = potrace_executable(config)
+  if potrace is None:
+    logger.warning(f"Potrace not found at `{config.potrace_path}`. Falling back to raster SVG export.")
+    generate_wall_svg(io.cropped, io.svg, scale=1)
+    logger.info(f"Saved raster SVG of cleaned background image in `{io.svg}`")
+    return
+
+  with metrics.timer(metrics.TOOL_SECONDS, tool="potrace"):
+    result = subprocess.run([potrace, io.cropped, "-b", "svg"], check=False, capture_output=True)
+  if result.returncode != 0:
+    metrics.inc(metrics.TOOL_FAILURES, tool="potrace")
+    logger.error(f"Potrace exited with code {result.returncode}: {result.stderr.decode(errors='replace').strip()}")
   logger.info(f"Traced cleaned background image as SVG in `{io.svg}`")
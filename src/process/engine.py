@@ -0,0 +1,197 @@
+"""
+This module provides the vertex-detection engines used by `edge.detect`. Every engine receives the same preprocessed
+image (thresholded, reduced thickness, specks removed) and returns the detected vertices as one contiguous array.
+
+Dependencies:
+- `functools`: Standard library for caching the thread pools.
+- `collections.abc`: Standard library for the callable type.
+- `concurrent.futures`: Standard library for the simplification thread pool.
+- `dataclasses`: For the vertex record.
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `src.config.config.Config`: Custom class for configuration settings.
+- `src.utility.pool`: Module providing reusable image buffers.
+
+Classes:
+- `Vertices`: A dataclass holding the vertices of every contour in one array, with CSR-style contour offsets.
+
+Constants:
+- `ENGINES`: The engines selectable through `Config.vertex_engine`, by name.
+- `SIMPLIFY_CHUNK`: The number of contours simplified per thread pool task.
+
+Functions:
+- `contour(binary: np.ndarray, config: Config) -> tuple[Vertices, int]`: Simplifies the contours of the wall edges.
+- `corner(binary: np.ndarray, config: Config) -> tuple[Vertices, int]`: Finds corners with the Shi-Tomasi response.
+- `simplify(contours: Sequence[np.ndarray], threads: int = 1, min_points: int = 0) -> list[np.ndarray]`: Simplifies contours in order.
+- `_simplify_chunk(contours: Sequence[np.ndarray], min_points: int) -> list[np.ndarray]`: Simplifies a chunk of contours.
+- `_executor(threads: int) -> ThreadPoolExecutor`: Returns the shared thread pool of a size.
+"""
+
+import functools
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from src.config.config import Config
+from src.utility import pool
+
+SIMPLIFY_CHUNK = 512  # Contours per task | Large enough to amortize the task overhead, small enough to balance
+
+
+@dataclass(frozen=True, slots=True)
+class Vertices:
+  """
+  A dataclass to hold the vertices of every contour in one contiguous array (CSR layout): the vertices of contour `i`
+  are `points[offsets[i]:offsets[i + 1]]`. Engines that do not trace contours return a single group. Contour
+  membership ends at `merge.close_vertices`, whose clusters may join vertices of several contours.
+
+  Attributes:
+      points (np.ndarray): An (N, 2) int32 array of vertex coordinates, `[x, y]`.
+      offsets (np.ndarray): A (C + 1,) int64 array of contour start offsets, from 0 to N.
+  """
+
+  points: np.ndarray
+  offsets: np.ndarray
+
+  def __len__(self) -> int:
+    return len(self.points)
+
+  @property
+  def contours(self) -> int:
+    return len(self.offsets) - 1
+
+  @staticmethod
+  def group(points: np.ndarray) -> "Vertices":
+    """
+    Wraps vertices that do not belong to contours into a single group.
+    """
+    points = np.ascontiguousarray(points, dtype=np.int32).reshape(-1, 2)
+    return Vertices(points, np.array([0, len(points)], dtype=np.int64))
+
+
+def contour(binary: np.ndarray, config: Config) -> tuple[Vertices, int]:
+  """
+  Detects vertices by simplifying the contours of the wall edges (default engine).
+
+  Args:
+      binary (np.ndarray): The preprocessed binary image, with black walls on a white background.
+      config (Config): An instance of the Config class containing configuration settings.
+
+  Process:
+      1. Performs edge detection using a single pixel morphological erosion.
+      2. Finds the external contours of the edge image.
+      3. Simplifies every contour with `approxPolyDP` (epsilon = 0.001 x arc length) and keeps its points, on
+         `config.simplify_threads` threads (see `simplify`).
+
+  Returns:
+      tuple[Vertices, int]: The vertices of every contour, and the number of traced contour points.
+  """
+  with pool.POOL.borrow() as take:
+    # Single pixel morphological erosion (edge detection)
+    kernel = np.ones((3, 3), np.uint8)
+    edges = cv2.erode(binary, kernel, dst=take(binary.shape))
+    cv2.subtract(binary, edges, dst=edges)
+
+    # Find contours in the edge image | The scratch buffer is not used afterwards, so it needs no copy
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+  # Find vertices of the image | One (K, 1, 2) array per contour, concatenated once
+  simplified = simplify(contours, config.simplify_threads, config.simplify_min_points)
+  traced: int = sum(len(points) for points in contours)
+  if not simplified:
+    return Vertices.group(np.empty((0, 2), dtype=np.int32)), traced
+  offsets = np.zeros(len(simplified) + 1, dtype=np.int64)
+  np.cumsum([len(points) for points in simplified], out=offsets[1:])
+  return Vertices(np.concatenate(simplified).reshape(-1, 2).astype(np.int32, copy=False), offsets), traced
+
+
+def corner(binary: np.ndarray, config: Config) -> tuple[Vertices, int]:
+  """
+  Detects vertices as the strongest corners of the Shi-Tomasi (minimum eigenvalue) response of the wall image.
+  The response, non-maximum suppression and minimum distance are computed by OpenCV over the whole image, so the
+  runtime does not depend on the number of contours, and inner corners of walls are found as well as outer ones.
+
+  Args:
+      binary (np.ndarray): The preprocessed binary image, with black walls on a white background.
+      config (Config): An instance of the Config class containing configuration settings.
+          `corner_quality` is the minimum response relative to the strongest corner, `corner_min_distance` the
+          minimum distance between two corners in pixels, and `corner_scale` the resolution of the response
+          relative to the image (eg: 0.5 is ~4x faster). Corners found at a reduced resolution are refined
+          at full resolution with `cornerSubPix`.
+
+  Returns:
+      tuple[Vertices, int]: The vertices in a single group, and 0 (no contours are traced).
+  """
+  # Downscale | The response is computed on every pixel, so its cost scales with the image area
+  small = binary
+  if config.corner_scale != 1:
+    small = cv2.resize(binary, None, fx=config.corner_scale, fy=config.corner_scale, interpolation=cv2.INTER_AREA)
+
+  corners = cv2.goodFeaturesToTrack(
+    small,
+    maxCorners=0,  # Unlimited
+    qualityLevel=config.corner_quality,
+    minDistance=max(1, round(config.corner_min_distance * config.corner_scale)),
+    blockSize=3,
+  )
+  if corners is None:
+    return Vertices.group(np.empty((0, 2), dtype=np.int32)), 0
+
+  # Map pixel centers back to the full resolution image, and refine there around each corner
+  corners = ((corners + 0.5) / config.corner_scale - 0.5).astype(np.float32)
+  if config.corner_scale != 1:
+    radius: int = int(np.ceil(1 / config.corner_scale)) + 1
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_COUNT, 10, 0.1)
+    corners = cv2.cornerSubPix(binary, corners, (radius, radius), (-1, -1), criteria)
+  return Vertices.group(np.rint(corners)), 0
+
+
+def simplify(contours: Sequence[np.ndarray], threads: int = 1, min_points: int = 0) -> list[np.ndarray]:
+  """
+  Simplifies closed contours with `approxPolyDP` (epsilon = 0.001 x arc length). Both OpenCV calls release the GIL,
+  so chunks of `SIMPLIFY_CHUNK` contours are simplified concurrently on a thread pool. The results are collected in
+  submission order, so they do not depend on the number of threads.
+
+  Args:
+      contours (Sequence[np.ndarray]): The contours, as returned by `cv2.findContours`.
+      threads (int, optional): The number of threads. 1 simplifies on the calling thread. Defaults to 1.
+      min_points (int, optional): Contours with at most this many points are kept as they are, skipping the
+          simplification (eg: specks and hatch marks). 0 simplifies every contour. Defaults to 0.
+
+  Returns:
+      list[np.ndarray]: The simplified contours, in the order of `contours`.
+  """
+  if threads <= 1 or len(contours) <= SIMPLIFY_CHUNK:
+    return _simplify_chunk(contours, min_points)
+
+  chunks = [contours[start : start + SIMPLIFY_CHUNK] for start in range(0, len(contours), SIMPLIFY_CHUNK)]
+  results = _executor(threads).map(_simplify_chunk, chunks, [min_points] * len(chunks))
+  return [points for chunk in results for points in chunk]
+
+
+def _simplify_chunk(contours: Sequence[np.ndarray], min_points: int) -> list[np.ndarray]:
+  """
+  Simplifies a chunk of contours, keeping contours with at most `min_points` points as they are.
+  """
+  return [
+    points if len(points) <= min_points else cv2.approxPolyDP(points, 0.001 * cv2.arcLength(points, True), True)
+    for points in contours
+  ]
+
+
+@functools.cache
+def _executor(threads: int) -> ThreadPoolExecutor:
+  """
+  Returns the thread pool of a size, shared by every call (threads are started once per process).
+  """
+  return ThreadPoolExecutor(max_workers=threads, thread_name_prefix="simplify")
+
+
+# Engines by name | Add new engines here to make them selectable in `config.json`
+ENGINES: dict[str, Callable[[np.ndarray, Config], tuple[Vertices, int]]] = {
+  "contour": contour,
+  "corner": corner,
+}
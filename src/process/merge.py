@@ -11,9 +11,9 @@ Dependencies:
 - `src.color`: Module for defining color constants.
 
 Functions:
-- `preview_on_image(io: IO, vertices) -> None`: Draws vertices on the input image and saves the result.
+- `preview_on_image(io: IO, vertices, image=None) -> None`: Draws vertices on the input image and saves the result.
 - `pairwise_distances(points)`: Calculates the pairwise Euclidean distances between points.
-- `close_vertices(io: IO, vertices, epsilon)`: Merges vertices that are within a specified epsilon distance and saves the result.
+- `close_vertices(io: IO, vertices, epsilon, image=None) -> np.ndarray`: Merges vertices that are within a specified epsilon distance and saves the result.
 """
 
 import cv2
@@ -23,30 +23,32 @@ from src.config.location import IO
 from . import color
 
 
-def preview_on_image(io: IO, vertices) -> None:
+def preview_on_image(io: IO, vertices, image: np.ndarray | None = None) -> None:
   """
   Draws vertices on the input image and saves the result.
 
   Args:
       io (IO): An instance of the IO class containing input/output paths.
-      vertices (list): A list of vertex coordinates.
+      vertices (array-like): An (N, 2) array of vertex coordinates.
+      image (np.ndarray | None, optional): The already-decoded input image, left unmodified. Defaults to None
+          (reads `io.input`).
 
   Process:
-      1. Reads the input image.
+      1. Reads the input image (or copies the already-decoded one).
       2. Ensures vertex points are converted to integers for drawing.
       3. Draws a circle at each vertex location on the image.
       4. Saves the image with the drawn vertices.
       5. Logs the count of vertices and the path where the image is saved.
   """
   # Read image
-  image = cv2.imread(io.input)
+  image = cv2.imread(io.input) if image is None else image.copy()
 
   # Ensure points are converted to integers for drawing
-  vertices = np.array(vertices, dtype=np.int32)
+  vertices = np.asarray(vertices).astype(np.int32).reshape(-1, 2)
 
   # Iterate through each point and draw a circle
-  for vertex in vertices:
-    cv2.circle(image, tuple(vertex), 1, color.MAGENTA, 3)
+  for x, y in vertices.tolist():
+    cv2.circle(image, (x, y), 1, color.MAGENTA, 3)
 
   # Save
   cv2.imwrite(io.merged_vertices, image)
@@ -59,52 +61,59 @@ def pairwise_distances(points):
   Calculates the pairwise Euclidean distances between points.
 
   Args:
-      points (list): A list of points.
+      points (array-like): An (N, 2) array or list of points.
 
   Returns:
       numpy.ndarray: A 2D array containing the pairwise distances between points.
   """
-  n: int = len(points)
-  distances = np.zeros((n, n))
-  for i in range(n):
-    for j in range(i + 1, n):
-      d = np.linalg.norm(np.array(points[i]) - np.array(points[j]))
-      distances[i, j] = d
-      distances[j, i] = d
-  return distances
+  points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+  return np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
 
 
-def close_vertices(io: IO, vertices, epsilon):
+def close_vertices(io: IO, vertices, epsilon, image: np.ndarray | None = None) -> np.ndarray:
   """
   Merges vertices that are within a specified epsilon distance and saves the result.
 
   Args:
       io (IO): An instance of the IO class containing input/output paths.
-      vertices (list): A list of vertex coordinates.
+      vertices (Vertices | array-like): The detected vertices, or an (N, 2) array of vertex coordinates. Contour
+          offsets are not used: a cluster may join vertices of several contours.
       epsilon (float): The maximum distance between vertices to be merged.
+      image (np.ndarray | None, optional): The already-decoded input image. Defaults to None (reads `io.input`).
 
   Process:
-      1. Initializes a set to keep track of visited vertices.
-      2. Iterates through each vertex and clusters close vertices based on the epsilon distance.
+      1. Sorts the vertices by x, so that the candidates of a vertex are a contiguous window of width 2 x epsilon.
+      2. Visits the vertices in order; each unvisited vertex starts a cluster with every later unvisited vertex of
+         its window that is within epsilon (distances are computed for the whole window at once).
       3. Calculates the mean position of each cluster and considers it as a merged point.
       4. Calls `preview_on_image` to draw the merged vertices on the image.
-      5. Returns a list of merged vertex coordinates.
+      5. Returns the merged vertex coordinates.
+
+  Returns:
+      np.ndarray: An (M, 2) float64 array of merged vertex coordinates.
   """
-  n: int = len(vertices)
-  visited = set()
-  merged_points = []
+  points = np.asarray(getattr(vertices, "points", vertices), dtype=np.float64).reshape(-1, 2)
+  n: int = len(points)
+  order = np.argsort(points[:, 0], kind="stable")
+  xs = points[order, 0]
+  lows = np.searchsorted(xs, xs - epsilon, side="left")
+  highs = np.searchsorted(xs, xs + epsilon, side="right")
+  rank = np.empty(n, dtype=np.int64)
+  rank[order] = np.arange(n)
+
+  visited = np.zeros(n, dtype=bool)
+  merged_points = np.empty((n, 2), dtype=np.float64)
+  count: int = 0
   for i in range(n):
-    if i in visited:
+    if visited[i]:
       continue
-    cluster = [vertices[i]]
-    visited.add(i)
-    for j in range(i + 1, n):
-      if j in visited:
-        continue
-      if pairwise_distances([vertices[i], vertices[j]])[0, 1] <= epsilon:
-        cluster.append(vertices[j])
-        visited.add(j)
-    merged_points.append(np.mean(cluster, axis=0).tolist())
-
-  preview_on_image(io, merged_points)
+    window = order[lows[rank[i]] : highs[rank[i]]]
+    window = window[(window >= i) & ~visited[window]]
+    cluster = window[np.linalg.norm(points[window] - points[i], axis=1) <= epsilon]
+    visited[cluster] = True
+    merged_points[count] = points[np.sort(cluster)].mean(axis=0)
+    count += 1
+
+  merged_points = merged_points[:count]
+  preview_on_image(io, merged_points, image)
   return merged_points
@@ -0,0 +1,63 @@
+"""
+This module provides functionality for removing specks (dust, text, hatch marks) from a binary floorplan image.
+It uses a single connected-components pass, so the cost does not depend on the number of specks.
+
+Dependencies:
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `src.utility.pool`: Module providing reusable image buffers.
+
+Functions:
+- `remove(binary: np.ndarray, min_area: int, min_extent: int, out: np.ndarray | None = None) -> tuple[np.ndarray, int, int]`: Removes small dark components.
+"""
+
+import cv2
+import numpy as np
+
+from src.utility import pool
+
+
+def remove(
+  binary: np.ndarray, min_area: int, min_extent: int, out: np.ndarray | None = None
+) -> tuple[np.ndarray, int, int]:
+  """
+  Removes dark components (walls are black on a white background) that are too small to be walls.
+
+  Args:
+      binary (np.ndarray): A binary image with black strokes on a white background.
+      min_area (int): Components with fewer pixels are removed. 0 disables the check.
+      min_extent (int): Components whose bounding box is smaller on both sides are removed. 0 disables the check.
+      out (np.ndarray | None, optional): The array receiving the filtered image, which may be `binary` itself.
+          Defaults to None (a new array, if anything is removed).
+
+  Process:
+      1. Labels the dark components of the inverted image with 8-connectivity and collects their statistics.
+      2. Flags components below the area or extent thresholds in a per-label lookup table.
+      3. Paints the flagged components white through the lookup table.
+
+  Returns:
+      tuple[np.ndarray, int, int]: The filtered image, the number of removed components and the estimated number of
+      boundary pixels they would have contributed to contour tracing.
+  """
+  if min_area <= 0 and min_extent <= 0:
+    return binary, 0, 0
+
+  with pool.POOL.borrow() as take:
+    inverted = cv2.bitwise_not(binary, dst=take(binary.shape))
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(
+      inverted, labels=take(binary.shape, np.int32), connectivity=8
+    )
+    area = stats[:, cv2.CC_STAT_AREA]
+    extent = np.maximum(stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT])
+    drop = (area < min_area) | (extent < min_extent)
+    drop[0] = False  # Label 0 is the (white) background
+    removed = int(np.count_nonzero(drop))
+    if removed == 0:
+      return binary, 0, 0
+
+    filtered = binary.copy() if out is None else out
+    if filtered is not binary:
+      np.copyto(filtered, binary)
+    filtered[np.take(drop, labels, out=take(binary.shape, np.bool_))] = 255
+  boundary = int(2 * (stats[drop, cv2.CC_STAT_WIDTH] + stats[drop, cv2.CC_STAT_HEIGHT]).sum())
+  return filtered, removed, boundary
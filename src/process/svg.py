@@ -1,6 +1,7 @@
 """
-Warning: This module is deprecated.
+Warning: `detect_walls` is deprecated.
 This module provides functionality for detecting walls in an image and generating an SVG representation of the detected walls.
+`generate_wall_svg` is kept as a raster fallback for environments where Potrace is not installed.
 
 Dependencies:
 - `PIL.Image`: Library for opening and manipulating images.
@@ -10,6 +11,7 @@ Dependencies:
 Functions:
 - `detect_walls(input, output, threshold_value=100, thickness_reduction_iterations=5, thickness_increase_iterations=3, debug=False)`: Detects walls in an image and saves the processed image.
 - `generate_wall_svg(input, output, scale=2)`: Generates an SVG representation of the walls detected in a binary image.
+- `_wall_rectangles(wall)`: Run-length encodes a boolean wall mask into merged rectangles.
 """
 
 from PIL import Image
@@ -63,6 +65,7 @@ def detect_walls(
 def generate_wall_svg(input: str, output: str, scale: int = 2) -> None:
   """
   Generates an SVG representation of the walls detected in a binary image.
+  Serves as the raster fallback for `postprocess.svg.trace` when Potrace is unavailable.
 
   Args:
       input (str): The path to the binary input image.
@@ -70,32 +73,51 @@ def generate_wall_svg(input: str, output: str, scale: int = 2) -> None:
       scale (int, optional): The scale factor for the SVG coordinates. Defaults to 2.
 
   Process:
-      1. Opens the binary input image.
-      2. Creates an SVG header with the specified dimensions.
-      3. Iterates over each pixel in the image to identify wall pixels.
-      4. For each black pixel, draws a rectangle in the SVG at the corresponding position.
-      5. Closes the SVG path and writes the SVG content to the specified output file.
+      1. Opens the binary input image as a grayscale NumPy array.
+      2. Run-length encodes each row into horizontal runs of black pixels.
+      3. Merges runs with identical extents on consecutive rows into rectangles.
+      4. Writes one rectangle per merged run into a single SVG path using a buffered writer.
   """
   # Open the binary image
   with Image.open(input) as img:
-    # Create SVG header
-    svg_header = f'<svg width="{img.width * scale}" height="{img.height * scale}" xmlns="http://www.w3.org/2000/svg">\n'
-
-    # Start SVG path
-    svg_path = '<path d="'
-
-    # Iterate over each pixel in the image
-    for y in range(img.height):
-      for x in range(img.width):
-        # Check pixel color (assuming black and white image)
-        if img.getpixel((x, y)) == 0:
-          # If pixel is black, draw a rectangle at that position
-          svg_path += f"M{x * scale},{y * scale}h{scale}v{scale}h-{scale}z"
-
-    # Close SVG path and SVG header
-    svg_path += '" />\n'
-    svg_footer = "</svg>\n"
-
-    # Write SVG to file
-    with open(output, "w") as f:
-      f.write(svg_header + svg_path + svg_footer)
+    pixels = np.asarray(img.convert("L"))
+  height, width = pixels.shape
+
+  # Write SVG header, one rectangle per merged run and the SVG footer
+  with open(output, "w", buffering=1 << 16) as f:
+    f.write(f'<svg width="{width * scale}" height="{height * scale}" xmlns="http://www.w3.org/2000/svg">\n')
+    f.write('<path d="')
+    f.writelines(
+      f"M{x * scale},{y * scale}h{w * scale}v{h * scale}h-{w * scale}z" for x, y, w, h in _wall_rectangles(pixels == 0)
+    )
+    f.write('" />\n')
+    f.write("</svg>\n")
+
+
+def _wall_rectangles(wall: np.ndarray) -> np.ndarray:
+  """
+  Converts a boolean wall mask into axis-aligned rectangles.
+
+  Args:
+      wall (np.ndarray): A 2D boolean array where True marks a wall pixel.
+
+  Returns:
+      np.ndarray: An (N, 4) integer array of rectangles as `[x, y, width, height]`.
+  """
+  # Horizontal runs | Padding guarantees every run has both a start and an end transition
+  padded = np.pad(wall.astype(np.int8), ((0, 0), (1, 1)))
+  transitions = np.diff(padded, axis=1)
+  rows, starts = np.nonzero(transitions == 1)
+  _, ends = np.nonzero(transitions == -1)  # Row-major order pairs each end with its start
+  if rows.size == 0:
+    return np.empty((0, 4), dtype=np.int64)
+
+  # Stack identical runs on consecutive rows | Sort by extent, then by row
+  order = np.lexsort((rows, ends, starts))
+  rows, starts, ends = rows[order], starts[order], ends[order]
+  continues = np.zeros(rows.size, dtype=bool)
+  continues[1:] = (starts[1:] == starts[:-1]) & (ends[1:] == ends[:-1]) & (rows[1:] == rows[:-1] + 1)
+  first = np.flatnonzero(~continues)
+  heights = np.diff(np.append(first, rows.size))
+
+  return np.column_stack((starts[first], rows[first], ends[first] - starts[first], heights))
@@ -0,0 +1,290 @@
+"""
+This module provides support for plan sets delivered as zip or tar archives, processed without extraction.
+
+Members are read lazily, in archive order (tar archives are read as a stream), and decoded by a `Prefetcher` that
+stays at most `config.prefetch_depth` members ahead of the pipeline. The encoded bytes and the decoded image of every
+member are passed to the pipeline. The outputs of `<archive>` go to `output/<archive-base>/<member-base>/`, or
+are packed into an output archive (zip or tar) as each member finishes.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `posixpath`: Standard library for normalizing member names.
+- `shutil`: Standard library for high-level file operations.
+- `tarfile`: Standard library for tar archives.
+- `tempfile`: Standard library for the staging folder of an output archive.
+- `time`: Standard library for time access.
+- `zipfile`: Standard library for zip archives.
+- `collections.abc`: Standard library for the iterator type.
+- `dataclasses`: For the per-member result and deriving a per-member configuration.
+- `cv2`: OpenCV library for decoding members.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `src.check.probe.InputRejected`: Custom exception for unusable inputs.
+- `src.config.config`: Custom module for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.pipeline.pipeline`: Custom module running the per-image pipeline.
+- `src.source.prefetch.Prefetcher`: Custom class decoding members ahead of the pipeline.
+
+Classes:
+- `MemberResult`: A dataclass representing the outcome of one archive member.
+
+Functions:
+- `is_archive(path: str) -> bool`: Checks if an input is a zip or tar archive.
+- `archive_base(path: str) -> str`: Returns the name of an archive without its (compound) extension.
+- `iter_members(path: str) -> Iterator[tuple[str, bytes]]`: Lazily yields the image members of an archive.
+- `run(config: Config, path: str, output_dir: str = "output", output_archive: str | None = None) -> list[MemberResult]`: Processes every image member of an archive.
+- `_decode(member: tuple[str, bytes]) -> tuple[np.ndarray, np.ndarray]`: Decodes an archive member.
+- `_open_output(path: str) -> zipfile.ZipFile | tarfile.TarFile`: Opens an output archive for writing.
+- `_safe_name(name: str) -> str | None`: Normalizes a member name, rejecting names that escape the output tree.
+- `_pack(archive: zipfile.ZipFile | tarfile.TarFile, folder: str, prefix: str) -> None`: Adds a folder to an archive.
+"""
+
+import os
+import posixpath
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.check.probe import InputRejected
+from src.config import location
+from src.config.config import VERSION, Config
+from src.pipeline import pipeline
+from src.source.prefetch import Prefetcher
+
+# Recognized archives | Compound extensions first
+TAR_EXTENSIONS = (".tar.gz", ".tar.bz2", ".tar.xz", ".tgz", ".tar")
+ZIP_EXTENSIONS = (".zip",)
+
+
+@dataclass(frozen=True, slots=True)
+class MemberResult:
+  """
+  A dataclass to hold the outcome of one archive member.
+
+  Attributes:
+      name (str): The name of the member inside the archive.
+      seconds (float): The processing time of the member.
+      error (str): The error message if processing failed or the member was rejected, empty otherwise.
+  """
+
+  name: str
+  seconds: float
+  error: str
+
+
+def is_archive(path: str) -> bool:
+  """
+  Checks if an input is a zip or tar archive, by extension.
+
+  Args:
+      path (str): The path to the input file.
+
+  Returns:
+      bool: True if the input is a zip or (compressed) tar archive.
+  """
+  return path.lower().endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS)
+
+
+def archive_base(path: str) -> str:
+  """
+  Returns the name of an archive without its directory and (compound) extension, eg: `plans` for `in/plans.tar.gz`.
+
+  Args:
+      path (str): The path to the archive.
+
+  Returns:
+      str: The base name of the archive.
+  """
+  name: str = os.path.basename(path)
+  for extension in ZIP_EXTENSIONS + TAR_EXTENSIONS:
+    if name.lower().endswith(extension):
+      return name[: -len(extension)]
+  return os.path.splitext(name)[0]
+
+
+def iter_members(path: str) -> Iterator[tuple[str, bytes]]:
+  """
+  Lazily yields the image members of an archive, in archive order. Only the current member is held in memory.
+  Folders, hidden files and members that are not images (by extension) are skipped. A member sharing its output
+  folder (`<member-base>/`, compared case-insensitively) with an earlier member is skipped with a warning, as their
+  outputs would overwrite each other.
+
+  Args:
+      path (str): The path to the zip or tar archive.
+
+  Yields:
+      tuple[str, bytes]: The normalized name and the encoded bytes of the next image member.
+  """
+
+  bases: set[str] = set()  # Output folders of the members yielded so far
+
+  def wanted(name: str) -> str | None:
+    safe = _safe_name(name)
+    if safe is None:
+      logger.warning(f"Skipped member `{name}` of `{path}` (outside the archive root)")
+      return None
+    if any(part.startswith(".") or part == "__MACOSX" for part in safe.split("/")):
+      return None
+    if not safe.lower().endswith(location.IMAGE_EXTENSIONS):
+      return None
+    base: str = os.path.splitext(safe)[0].lower()
+    if base in bases:
+      logger.warning(f"Skipped member `{name}` of `{path}` (shares its output folder with an earlier member)")
+      return None
+    bases.add(base)
+    return safe
+
+  if path.lower().endswith(ZIP_EXTENSIONS):
+    with zipfile.ZipFile(path) as archive:
+      for info in archive.infolist():  # The central directory only, members are read on demand
+        name = None if info.is_dir() else wanted(info.filename)
+        if name is not None:
+          yield name, archive.read(info)
+    return
+
+  with tarfile.open(path, "r|*") as archive:  # Streaming mode, members must be read in order
+    for member in archive:
+      name = wanted(member.name) if member.isfile() else None
+      if name is not None:
+        yield name, archive.extractfile(member).read()
+
+
+def run(
+  config: Config,
+  path: str,
+  output_dir: str = "output",
+  output_archive: str | None = None,
+) -> list[MemberResult]:
+  """
+  Processes every image member of an archive without extracting it.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings, including the
+          `prefetch_*` settings.
+      path (str): The path to the zip or tar archive.
+      output_dir (str, optional): The root directory of the outputs. Defaults to "output".
+      output_archive (str | None, optional): A zip or tar archive to pack the outputs into, instead of writing them
+          to `output/<archive-base>/`. Members are staged in a temporary folder while they are processed. Paths
+          embedded into generated scripts assume the archive is extracted next to itself, into a folder named after
+          it. Defaults to None.
+
+  Process:
+      1. Reads and decodes up to `prefetch_depth` members ahead, on `prefetch_threads` I/O threads.
+      2. Runs the pipeline on the decoded image of every member, with its outputs in
+         `output/<archive-base>/<member-base>/` (or a staging folder, packed into the output archive and removed).
+      3. Collects per-member timings, rejections and errors, and logs the time spent waiting on input.
+
+  Returns:
+      list[MemberResult]: The outcome of every image member, in archive order.
+  """
+  root: str = f"{output_dir}/{archive_base(path)}"
+  members = Prefetcher(
+    iter_members(path),
+    _decode,
+    config.prefetch_depth,
+    config.prefetch_threads,
+    config.prefetch_memory_mb * 1024 * 1024,
+    lambda loaded: loaded[0].nbytes + (0 if loaded[1] is None else loaded[1].nbytes),
+  )
+
+  packed: zipfile.ZipFile | tarfile.TarFile | None = None
+  published_root: str = ""
+  if output_archive is not None:
+    packed = _open_output(output_archive)
+    os.makedirs(output_dir, exist_ok=True)
+    root = tempfile.mkdtemp(prefix=".archive-", dir=output_dir)
+    published_root = os.path.join(os.path.dirname(output_archive), archive_base(output_archive))
+
+  results: list[MemberResult] = []
+  try:
+    with members:
+      for member, (data, image) in members:
+        name: str = member[0]
+        location.generate_output_folder(name, root)
+        io = location.generate_io_paths(name, path, root)
+        published = location.generate_io_paths(name, path, published_root) if packed is not None else None
+
+        start: float = time.perf_counter()
+        try:
+          pipeline.run(io, replace(config, filename=name), VERSION, published, data=data, image=image)
+          results.append(MemberResult(name, time.perf_counter() - start, ""))
+        except InputRejected as error:
+          logger.error(str(error))
+          results.append(MemberResult(name, time.perf_counter() - start, str(error)))
+        except (OSError, cv2.error) as error:
+          logger.exception(f"Failed to process `{name}` of `{path}`")
+          results.append(MemberResult(name, time.perf_counter() - start, repr(error)))
+        del member, data, image  # Release the member before taking the next one
+
+        if packed is not None:
+          base: str = os.path.splitext(name)[0]
+          _pack(packed, f"{root}/{base}", base)
+          shutil.rmtree(f"{root}/{base}")
+  finally:
+    if packed is not None:
+      packed.close()
+      shutil.rmtree(root, ignore_errors=True)
+
+  failed: int = sum(bool(result.error) for result in results)
+  logger.info(f"Processed {len(results)} images of `{path}` ({len(results) - failed} succeeded)")
+  logger.info(members.summary())
+  if packed is not None:
+    logger.info(f"Packed outputs into `{output_archive}`")
+  return results
+
+
+def _decode(member: tuple[str, bytes]) -> tuple[np.ndarray, np.ndarray]:
+  """
+  Decodes an archive member, returning its encoded bytes (as an array) and its image. Runs in an I/O thread.
+  """
+  data: np.ndarray = np.frombuffer(member[1], np.uint8)
+  return data, cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def _open_output(path: str) -> zipfile.ZipFile | tarfile.TarFile:
+  """
+  Opens an output archive for writing. The format and compression follow the extension.
+  """
+  os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+  lower: str = path.lower()
+  if lower.endswith(ZIP_EXTENSIONS):
+    return zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+  if lower.endswith((".tar.gz", ".tgz")):
+    return tarfile.open(path, "w:gz")
+  if lower.endswith(".tar.bz2"):
+    return tarfile.open(path, "w:bz2")
+  if lower.endswith(".tar.xz"):
+    return tarfile.open(path, "w:xz")
+  return tarfile.open(path, "w")
+
+
+def _safe_name(name: str) -> str | None:
+  """
+  Normalizes a member name to a relative POSIX path, or returns None if it is absolute or escapes the archive root.
+  """
+  normalized: str = posixpath.normpath(name.replace("\\", "/"))
+  if normalized.startswith(("/", "../")) or normalized in (".", "..") or ":" in normalized.split("/")[0]:
+    return None
+  return normalized
+
+
+def _pack(archive: zipfile.ZipFile | tarfile.TarFile, folder: str, prefix: str) -> None:
+  """
+  Adds every file of a folder to an archive, under `prefix/`.
+  """
+  for directory, _, names in os.walk(folder):
+    for name in sorted(names):
+      file: str = os.path.join(directory, name)
+      arcname: str = posixpath.join(prefix, os.path.relpath(file, folder).replace(os.sep, "/"))
+      if isinstance(archive, zipfile.ZipFile):
+        archive.write(file, arcname)
+      else:
+        archive.add(file, arcname)
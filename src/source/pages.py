@@ -0,0 +1,221 @@
+"""
+This module provides support for multi-page inputs (multi-page TIFF and PDF plan sets).
+
+Pages are decoded lazily, one at a time, and written to `output/<base>/pages/`. Every page is then processed as an
+independent pipeline job on a process pool, with its outputs under `output/<base>/page-NNN/`. A combined Typst report
+summarizing every page is written to `output/<base>/report.typ`.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `time`: Standard library for time access.
+- `concurrent.futures`: Standard library for the worker pool.
+- `dataclasses`: For the per-page result and deriving a per-page configuration.
+- `PIL.Image`: For lazily seeking through TIFF frames.
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `pymupdf` (optional): Required only for PDF inputs (`pip install pymupdf`).
+- `src.config.config`: Custom module for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.documentation.typst`: Custom module for the combined report.
+- `src.pipeline.pipeline`: Custom module running the per-image pipeline.
+
+Classes:
+- `PageResult`: A dataclass representing the outcome of one page.
+
+Functions:
+- `is_multipage(path: str) -> bool`: Checks if an input must be split into pages.
+- `iter_pages(path: str, dpi: int = 200) -> Iterator[np.ndarray]`: Lazily yields the pages of a TIFF or PDF.
+- `run(config: Config, input_dir: str = "input", output_dir: str = "output", workers: int | None = None) -> list[PageResult]`: Processes every page of a multi-page input.
+- `_process_page(config: Config, pages_dir: str, output_dir: str, name: str) -> tuple[int, float]`: Runs the pipeline for one page.
+- `_count_lines(path: str) -> int`: Counts the lines of a text file.
+"""
+
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.config import location
+from src.config.config import VERSION, Config
+from src.documentation import typst
+from src.pipeline import pipeline
+
+# Inputs that may contain several pages
+TIFF_EXTENSIONS = (".tif", ".tiff")
+PDF_EXTENSIONS = (".pdf",)
+PAGES = "pages"
+
+
+@dataclass(frozen=True, slots=True)
+class PageResult:
+  """
+  A dataclass to hold the outcome of one page.
+
+  Attributes:
+      page (int): The 1-based page number.
+      name (str): The name of the page, also the name of its output folder.
+      vertices (int): The number of merged vertices detected on the page.
+      seconds (float): The processing time of the page.
+      error (str): The error message if processing failed, empty otherwise.
+  """
+
+  page: int
+  name: str
+  vertices: int
+  seconds: float
+  error: str
+
+
+def is_multipage(path: str) -> bool:
+  """
+  Checks if an input must be split into pages (any PDF, or a TIFF with more than one frame).
+
+  Args:
+      path (str): The path to the input file.
+
+  Returns:
+      bool: True if the input is a PDF or a multi-frame TIFF.
+  """
+  extension: str = os.path.splitext(path)[1].lower()
+  if extension in PDF_EXTENSIONS:
+    return True
+  if extension in TIFF_EXTENSIONS:
+    with Image.open(path) as im:
+      return getattr(im, "n_frames", 1) > 1
+  return False
+
+
+def iter_pages(path: str, dpi: int = 200) -> Iterator[np.ndarray]:
+  """
+  Lazily yields the pages of a TIFF or PDF as BGR images. Only one decoded page is held at a time.
+
+  Args:
+      path (str): The path to the input file.
+      dpi (int, optional): The rasterization resolution of PDF pages. Defaults to 200.
+
+  Yields:
+      np.ndarray: The next page as a BGR image.
+  """
+  if os.path.splitext(path)[1].lower() in PDF_EXTENSIONS:
+    try:
+      import pymupdf
+    except ImportError as error:
+      raise ImportError("PDF inputs require PyMuPDF. Install it with `pip install pymupdf`.") from error
+
+    with pymupdf.open(path) as document:
+      for page in document:
+        pixmap = page.get_pixmap(dpi=dpi, alpha=False)
+        rgb = np.frombuffer(pixmap.samples, np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+        yield cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR if pixmap.n == 3 else cv2.COLOR_GRAY2BGR)
+    return
+
+  with Image.open(path) as im:
+    for index in range(getattr(im, "n_frames", 1)):
+      im.seek(index)  # TIFF frames are decoded on access
+      yield cv2.cvtColor(np.asarray(im.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def run(
+  config: Config, input_dir: str = "input", output_dir: str = "output", workers: int | None = None
+) -> list[PageResult]:
+  """
+  Processes every page of a multi-page input as an independent pipeline job.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      input_dir (str, optional): The directory containing the input file. Defaults to "input".
+      output_dir (str, optional): The root directory of the outputs. Defaults to "output".
+      workers (int | None, optional): The number of pool processes. Defaults to the number of CPUs.
+
+  Process:
+      1. Decodes one page at a time and saves it in `output/<base>/pages/page-NNN.png`.
+      2. Submits the page to the pool, waiting while `2 * workers` pages are queued so that decoding never runs
+         far ahead of processing.
+      3. Collects per-page vertex counts, timings and errors.
+      4. Generates the combined Typst report in `output/<base>/report.typ`.
+
+  Returns:
+      list[PageResult]: The outcome of every page, in page order.
+  """
+  workers = workers or os.cpu_count() or 1
+  base: str = os.path.splitext(config.filename)[0]
+  root: str = f"{output_dir}/{base}"
+  pages_dir: str = f"{root}/{PAGES}"
+  os.makedirs(pages_dir, exist_ok=True)
+
+  futures: dict[str, Future] = {}
+  with ProcessPoolExecutor(max_workers=workers) as pool:
+    for index, page in enumerate(iter_pages(f"{input_dir}/{config.filename}"), start=1):
+      name: str = f"page-{index:03d}.png"
+      cv2.imwrite(f"{pages_dir}/{name}", page)
+      del page  # Release the decoded page before decoding the next one
+      futures[name] = pool.submit(_process_page, config, pages_dir, root, name)
+
+      # Bound the number of queued pages
+      queued = [future for future in futures.values() if not future.done()]
+      if len(queued) >= 2 * workers:
+        wait(queued, return_when=FIRST_COMPLETED)
+
+  results: list[PageResult] = []
+  for index, (name, future) in enumerate(futures.items(), start=1):
+    page_name: str = os.path.splitext(name)[0]
+    if future.exception() is not None:
+      logger.error(f"Failed to process page {index} of `{config.filename}`: {future.exception()!r}")
+      results.append(PageResult(index, page_name, 0, 0.0, repr(future.exception())))
+      continue
+    vertices, seconds = future.result()
+    results.append(PageResult(index, page_name, vertices, seconds, ""))
+
+  logger.info(f"Processed {len(results)} pages of `{config.filename}` ({sum(not r.error for r in results)} succeeded)")
+  typst.generate_pages_report(
+    f"{root}/report.typ",
+    config,
+    VERSION,
+    [(str(r.page), r.name, str(r.vertices), f"{r.seconds:.2f}", "Failed" if r.error else "OK") for r in results],
+  )
+  return results
+
+
+def _process_page(config: Config, pages_dir: str, output_dir: str, name: str) -> tuple[int, float]:
+  """
+  Runs the pipeline for one page. Runs in a pool process.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      pages_dir (str): The directory containing the extracted pages.
+      output_dir (str): The root directory of the page outputs (`output/<base>`).
+      name (str): The filename of the page.
+
+  Returns:
+      tuple[int, float]: The number of merged vertices and the processing time in seconds.
+
+  Raises:
+      InputRejected: If the page is unusable (eg: blank page).
+  """
+  start: float = time.perf_counter()
+  page_config: Config = replace(config, filename=name)
+  io = location.generate_io_paths(name, pages_dir, output_dir)
+  location.generate_output_folder(name, output_dir)
+  pipeline.run(io, page_config, VERSION)
+  return _count_lines(io.coordinates), time.perf_counter() - start
+
+
+def _count_lines(path: str) -> int:
+  """
+  Counts the lines of a text file.
+
+  Args:
+      path (str): The path to the file.
+
+  Returns:
+      int: The number of lines.
+  """
+  with open(path, "r") as file:
+    return sum(1 for _ in file)
@@ -0,0 +1,192 @@
+"""
+This module provides a prefetching producer/consumer stage that overlaps input I/O and decoding with processing.
+
+Items are taken from a (lazy) iterable in order by a reader thread, and loaded (eg: read and decoded as an image)
+concurrently by I/O threads, while the consumer processes the current item. Loaded items are delivered in input
+order, and errors of the iterable or of a load are raised by the consumer at the position of the failing item.
+Loading stays at most `depth` items ahead of the consumer, and is held back while the loaded items waiting for the
+consumer exceed the memory budget. The time the consumer spends waiting on input and the loading time are recorded,
+so an I/O-bound run can be told from a CPU-bound one.
+
+Dependencies:
+- `threading`: Standard library for guarding the loading time.
+- `time`: Standard library for time access.
+- `collections`: Standard library for the queue of items loaded ahead.
+- `collections.abc`: Standard library for the callable and iterator types.
+- `concurrent.futures`: Standard library for the reader and I/O threads.
+- `typing`: Standard library for the generic item and loaded item types.
+- `src.metrics.metrics`: Records the input wait and decode time of every item.
+
+Classes:
+- `Prefetcher`: Iterates over items loaded ahead of time by I/O threads.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Generic, TypeVar
+
+from src.metrics import metrics
+
+T = TypeVar("T")  # The type of the items
+
+_END = object()  # Taken after the last item
+
+
+class Prefetcher(Generic[T]):  # noqa: UP046 (PEP 695 generics require Python 3.12)
+  """
+  Iterates over `(item, loaded)` pairs, in the order of `items`, loading up to `depth` items ahead on I/O threads.
+  Use as a context manager, so that the threads stop when the consumer stops early.
+
+  Example:
+      with Prefetcher(names, lambda name: cv2.imread(name), depth=2, threads=2) as images:
+        for name, image in images:
+          ...
+      logger.info(images.summary())
+
+  Attributes:
+      depth (int): The maximum number of items loaded ahead of the consumer. 0 loads every item on the consumer
+          thread, when it is needed (no prefetching).
+      threads (int): The number of I/O threads.
+      max_bytes (int): The memory budget of the items loaded ahead. Items being loaded count as the size of the last
+          loaded item. At least one item is always loaded ahead, whatever its size.
+      count (int): The number of items delivered.
+      waited (float): The time the consumer spent waiting on input, in seconds.
+      loaded (float): The total loading time, in seconds (summed over the I/O threads).
+      throttled (int): The number of times loading ahead was held back by the memory budget.
+  """
+
+  def __init__(
+    self,
+    items: Iterable[T],
+    load: Callable[[T], Any],
+    depth: int = 2,
+    threads: int = 2,
+    max_bytes: int = 1024 * 1024 * 1024,
+    size: Callable[[Any], int] = lambda loaded: getattr(loaded, "nbytes", 0),
+  ) -> None:
+    self.depth = depth
+    self.threads = max(1, threads)
+    self.max_bytes = max_bytes
+    self.count = 0
+    self.waited = 0.0
+    self.loaded = 0.0
+    self.throttled = 0
+    self._items: Iterator[T] = iter(items)
+    self._load = load
+    self._size = size
+    self._lock = threading.Lock()
+    self._pending: deque[Future] = deque()  # Loads of the next items, in order
+    self._exhausted = False
+    self._last_size = 0
+    self._reader: ThreadPoolExecutor | None = None
+    self._loaders: ThreadPoolExecutor | None = None
+    self._start = time.perf_counter()
+
+  def __enter__(self) -> "Prefetcher[T]":
+    self._start = time.perf_counter()
+    self._open()
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.close()
+
+  def __iter__(self) -> Iterator[tuple[T, Any]]:
+    self._open()
+    while not self._exhausted:
+      start: float = time.perf_counter()
+      if self.depth > 0:
+        self._fill()
+        loaded = self._pending.popleft().result()  # Raises the error of the item, if any
+      else:
+        loaded = self._timed_load(next(self._items, _END))
+
+      waited: float = time.perf_counter() - start
+      self.waited += waited
+      metrics.observe(metrics.STAGE_SECONDS, waited, stage="input_wait")
+      if loaded is _END:
+        self._exhausted = True
+        return
+      self._fill()  # Keep loading while the consumer processes this item
+      self.count += 1
+      yield loaded[:2]
+
+  def close(self) -> None:
+    """
+    Stops the reader and I/O threads and drops the items loaded ahead. Items being loaded are finished first.
+    """
+    for future in self._pending:
+      future.cancel()
+    self._pending.clear()
+    for executor in (self._reader, self._loaders):
+      if executor is not None:
+        executor.shutdown(cancel_futures=True)
+    self._reader = self._loaders = None
+
+  def summary(self) -> str:
+    """
+    Returns a one-line report of the time spent waiting on input.
+
+    Returns:
+        str: The input wait of the consumer (total and share of the run), the loading time and how often the memory
+        budget held back loading.
+    """
+    elapsed: float = max(time.perf_counter() - self._start, 1e-9)
+    return (
+      f"Waited {self.waited:.2f} s on input over {self.count} items ({self.waited / elapsed:.0%} of {elapsed:.2f} s); "
+      f"loading took {self.loaded:.2f} s on {self.threads if self.depth > 0 else 0} I/O threads "
+      f"(depth {self.depth}), held back {self.throttled} times by the memory budget"
+    )
+
+  def _open(self) -> None:
+    """
+    Starts the reader and I/O threads, unless they are running or prefetching is disabled.
+    """
+    if self.depth > 0 and self._loaders is None:
+      # A single reader, as `items` may be read sequentially only (eg: a tar stream)
+      self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch-read")
+      self._loaders = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="prefetch")
+
+  def _fill(self) -> None:
+    """
+    Submits the next items until `depth` items are loaded ahead, or the memory budget is reached.
+    """
+    while not self._exhausted and len(self._pending) < self.depth:
+      if self._pending and self._held_bytes() >= self.max_bytes:
+        self.throttled += 1
+        return
+      taken: Future = self._reader.submit(next, self._items, _END)
+      self._pending.append(self._loaders.submit(lambda taken=taken: self._timed_load(taken.result())))
+
+  def _held_bytes(self) -> int:
+    """
+    Returns the memory of the items loaded ahead, counting items being loaded as the size of the last loaded item.
+    """
+    held: int = 0
+    for future in self._pending:
+      if not future.done():
+        held += self._last_size
+      elif not future.cancelled() and future.exception() is None and future.result() is not _END:
+        held += future.result()[2]
+    return held
+
+  def _timed_load(self, item: T) -> tuple[T, Any, int] | object:
+    """
+    Loads an item, recording the loading time.
+
+    Returns:
+        tuple[T, Any, int] | object: The item, the loaded item and its size, or `_END` after the last item.
+    """
+    if item is _END:
+      return _END
+    start: float = time.perf_counter()
+    loaded = self._load(item)
+    seconds: float = time.perf_counter() - start
+    size: int = 0 if loaded is None else self._size(loaded)
+    with self._lock:
+      self.loaded += seconds
+      self._last_size = size
+    metrics.observe(metrics.STAGE_SECONDS, seconds, stage="decode")
+    return item, loaded, size
@@ -0,0 +1,287 @@
+"""
+This module provides an interactive tuner for the threshold and thickness iterations, with a headless replay mode.
+
+The processing steps form a chain (grayscale -> binary -> reduced thickness -> vertices / cleaned background), and
+each parameter only affects the steps below it. Every step is memoized by the parameters it depends on, so moving a
+slider only recomputes the steps downstream of that parameter: changing `thickness_increase_iterations` re-runs a
+single erosion, and returning to a previous value reuses its results. Previews stay interactive on full-size plans.
+
+Dependencies:
+- `json`: Standard library for JSON operations.
+- `os`: Standard library for interacting with the operating system.
+- `time`: Standard library for time access.
+- `collections`: Standard library for the memoized results.
+- `dataclasses`: For the parameter and step records.
+- `cv2`: OpenCV library for image processing.
+- `numpy`: Library for numerical operations.
+- `loguru.logger`: For logging information.
+- `src.config.config.Config`: Custom class for configuration settings.
+- `src.process`: Custom modules for colors, speck removal and the vertex-detection engines.
+- `src.utility.save`: Custom module for atomic file writes.
+
+Classes:
+- `Parameters`: A dataclass representing the tuned parameters.
+- `Step`: A dataclass representing one replayed parameter change.
+- `Tuner`: Memoized processing of one image for a changing set of parameters.
+
+Functions:
+- `run(path: str, config: Config, config_path: str = "config.json") -> None`: Opens the interactive tuner.
+- `replay(path: str, config: Config, script: str, output_dir: str) -> list[Step]`: Replays a parameter script headless.
+- `read_script(script: str) -> list[dict[str, int]]`: Reads a parameter script.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.process import color, engine, speck
+from src.utility import save
+
+# Trackbars | Parameter name -> (label, maximum)
+TRACKBARS: dict[str, tuple[str, int]] = {
+  "threshold_value": ("Threshold", 255),
+  "thickness_reduction_iterations": ("Reduction", 30),
+  "thickness_increase_iterations": ("Increase", 30),
+}
+WINDOW = "Tuner | s: save to config, q: quit"
+BACKGROUND_WINDOW = "Tuner | Cleaned Background"
+MEMO_SIZE = 8  # Results kept per step, per combination of upstream parameters
+
+
+@dataclass(frozen=True, slots=True)
+class Parameters:
+  """
+  A dataclass to hold the tuned parameters.
+
+  Attributes:
+      threshold_value (int): The threshold of the binary image.
+      thickness_reduction_iterations (int): The number of dilations reducing the thickness of walls.
+      thickness_increase_iterations (int): The number of erosions restoring the thickness of the cleaned walls.
+  """
+
+  threshold_value: int
+  thickness_reduction_iterations: int
+  thickness_increase_iterations: int
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+  """
+  A dataclass to hold one replayed parameter change.
+
+  Attributes:
+      parameters (Parameters): The parameters after the change.
+      recomputed (tuple[str, ...]): The steps that were recomputed (the others were reused).
+      vertices (int): The number of detected vertices.
+      seconds (float): The time spent updating the previews.
+  """
+
+  parameters: Parameters
+  recomputed: tuple[str, ...]
+  vertices: int
+  seconds: float
+
+
+class Tuner:
+  """
+  Memoized processing of one image for a changing set of parameters.
+
+  Attributes:
+      image (np.ndarray): The input image.
+      config (Config): The configuration, with the current parameters.
+      recomputed (list[str]): The steps recomputed by the last `update`.
+  """
+
+  def __init__(self, image: np.ndarray, config: Config) -> None:
+    self.image = image
+    self.config = config
+    self.recomputed: list[str] = []
+    self._memo: dict[str, OrderedDict] = {}
+
+  @property
+  def parameters(self) -> Parameters:
+    return Parameters(
+      self.config.threshold_value, self.config.thickness_reduction_iterations, self.config.thickness_increase_iterations
+    )
+
+  def update(self, **changes: int) -> tuple[engine.Vertices, np.ndarray, np.ndarray]:
+    """
+    Applies parameter changes and computes the previews, recomputing only the steps downstream of the changes.
+
+    Args:
+        **changes (int): The changed parameters, by `Config` field name.
+
+    Returns:
+        tuple[engine.Vertices, np.ndarray, np.ndarray]: The vertices, the vertex overlay and the cleaned background.
+    """
+    self.config = replace(self.config, **changes)
+    self.recomputed = []
+    vertices = self.vertices()
+    overlay = self.image.copy()
+    for x, y in vertices.points.tolist():
+      cv2.circle(overlay, (x, y), 3, color.MAGENTA, -1)
+    return vertices, overlay, self.cleaned()
+
+  def gray(self) -> np.ndarray:
+    return self._step("gray", (), lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY))
+
+  def binary(self) -> np.ndarray:
+    threshold: int = self.config.threshold_value
+    return self._step("binary", (threshold,), lambda: cv2.threshold(self.gray(), threshold, 255, cv2.THRESH_BINARY)[1])
+
+  def reduced(self) -> np.ndarray:
+    key = (self.config.threshold_value, self.config.thickness_reduction_iterations)
+    kernel = np.ones((3, 3), np.uint8)
+    return self._step("reduced", key, lambda: cv2.dilate(self.binary(), kernel, iterations=key[1]))
+
+  def vertices(self) -> engine.Vertices:
+    key = (self.config.threshold_value, self.config.thickness_reduction_iterations)
+
+    def detect() -> engine.Vertices:
+      # Same steps as `edge.detect` | Speck removal copies, so the memoized reduced image is left untouched
+      filtered, _, _ = speck.remove(self.reduced(), self.config.speck_min_area, self.config.speck_min_extent)
+      return engine.ENGINES[self.config.vertex_engine](filtered, self.config)[0]
+
+    return self._step("vertices", key, detect)
+
+  def cleaned(self) -> np.ndarray:
+    key = (
+      self.config.threshold_value,
+      self.config.thickness_reduction_iterations,
+      self.config.thickness_increase_iterations,
+    )
+    kernel = np.ones((3, 3), np.uint8)
+    return self._step("cleaned", key, lambda: cv2.erode(self.reduced(), kernel, iterations=key[2]))
+
+  def _step(self, name: str, key: tuple, compute):
+    """
+    Returns the memoized result of a step for the parameters it depends on, computing it if needed.
+    """
+    memo = self._memo.setdefault(name, OrderedDict())
+    if key in memo:
+      memo.move_to_end(key)
+      return memo[key]
+    result = compute()
+    self.recomputed.append(name)
+    memo[key] = result
+    if len(memo) > MEMO_SIZE:
+      memo.popitem(last=False)
+    return result
+
+
+def run(path: str, config: Config, config_path: str = "config.json") -> None:
+  """
+  Opens the interactive tuner: one trackbar per parameter, with the vertex overlay and the cleaned background.
+
+  Args:
+      path (str): The path to the input image.
+      config (Config): An instance of the Config class containing configuration settings.
+      config_path (str, optional): The configuration file updated when pressing `s`. Defaults to "config.json".
+
+  Process:
+      1. Creates the windows and trackbars, initialized from the configuration.
+      2. Polls the trackbars; when they move, updates the previews (coalescing fast slider drags).
+      3. Pressing `s` writes the parameters to the configuration file, `q` or Esc closes the tuner.
+  """
+  tuner = Tuner(cv2.imread(path), config)
+  cv2.namedWindow(WINDOW, cv2.WINDOW_NORMAL)
+  cv2.namedWindow(BACKGROUND_WINDOW, cv2.WINDOW_NORMAL)
+  for name, (label, maximum) in TRACKBARS.items():
+    cv2.createTrackbar(label, WINDOW, getattr(config, name), maximum, lambda _: None)
+
+  shown: Parameters | None = None
+  try:
+    while True:
+      changes = {name: cv2.getTrackbarPos(label, WINDOW) for name, (label, _) in TRACKBARS.items()}
+      if Parameters(**changes) != shown:
+        start: float = time.perf_counter()
+        vertices, overlay, cleaned = tuner.update(**changes)
+        cv2.imshow(WINDOW, overlay)
+        cv2.imshow(BACKGROUND_WINDOW, cleaned)
+        shown = tuner.parameters
+        seconds: float = time.perf_counter() - start
+        logger.info(
+          f"{shown} | {len(vertices)} vertices | recomputed {tuner.recomputed or 'nothing'} in {seconds * 1000:.0f} ms"
+        )
+
+      key: int = cv2.waitKey(30) & 0xFF
+      if key == ord("s"):
+        with open(config_path) as file:
+          data = json.load(file)
+        save.write_atomic(config_path, json.dumps({**data, **changes}, indent=2) + "\n")
+        logger.info(f"Saved {shown} to `{config_path}`")
+      elif key in (ord("q"), 27):
+        break
+  finally:
+    cv2.destroyAllWindows()
+
+
+def replay(path: str, config: Config, script: str, output_dir: str) -> list[Step]:
+  """
+  Replays a parameter script without any window, saving the previews of every step.
+
+  Args:
+      path (str): The path to the input image.
+      config (Config): An instance of the Config class containing configuration settings.
+      script (str): The path to the parameter script (see `read_script`).
+      output_dir (str): The directory of the previews (`step-NNN-vertices.png`, `step-NNN-background.png`).
+
+  Returns:
+      list[Step]: One step per line of the script.
+  """
+  os.makedirs(output_dir, exist_ok=True)
+  tuner = Tuner(cv2.imread(path), config)
+  steps: list[Step] = []
+  for index, changes in enumerate(read_script(script), start=1):
+    start: float = time.perf_counter()
+    vertices, overlay, cleaned = tuner.update(**changes)
+    seconds: float = time.perf_counter() - start
+    cv2.imwrite(os.path.join(output_dir, f"step-{index:03d}-vertices.png"), overlay)
+    cv2.imwrite(os.path.join(output_dir, f"step-{index:03d}-background.png"), cleaned)
+    steps.append(Step(tuner.parameters, tuple(tuner.recomputed), len(vertices), seconds))
+    logger.info(
+      f"Step {index}: {tuner.parameters} | {len(vertices)} vertices | "
+      f"recomputed {tuner.recomputed or 'nothing'} in {seconds * 1000:.0f} ms"
+    )
+  return steps
+
+
+def read_script(script: str) -> list[dict[str, int]]:
+  """
+  Reads a parameter script: one step per line, as space-separated `name=value` changes. Blank lines and lines
+  starting with `#` are ignored.
+
+  Example:
+      threshold_value=120
+      thickness_reduction_iterations=4 thickness_increase_iterations=2
+
+  Args:
+      script (str): The path to the parameter script.
+
+  Returns:
+      list[dict[str, int]]: The changes of every step.
+
+  Raises:
+      ValueError: If a line changes something other than a tuned parameter.
+  """
+  steps: list[dict[str, int]] = []
+  with open(script) as file:
+    for number, line in enumerate(file, start=1):
+      line = line.strip()
+      if not line or line.startswith("#"):
+        continue
+      changes: dict[str, int] = {}
+      for change in line.split():
+        name, _, value = change.partition("=")
+        if name not in TRACKBARS or not value:
+          raise ValueError(f"`{script}` line {number}: expected `name=value` with a name in {list(TRACKBARS)}")
+        changes[name] = int(value)
+      steps.append(changes)
+  return steps
@@ -0,0 +1,95 @@
+"""
+This module provides a per-process pool of reusable image buffers, keyed by shape and dtype.
+
+Batch runs process thousands of images of the same resolution. Without a pool, every stage allocates fresh full-size
+arrays per image (grayscale, binary, dilated, eroded, overlay), which churns the allocator and fragments the resident
+memory. Stages borrow buffers for their duration, write into them through the OpenCV `dst=` parameters, and give them
+back when they return. Borrowing is thread-safe, so concurrent stages never share a buffer.
+
+Dependencies:
+- `threading`: Standard library for the pool lock.
+- `collections`: Standard library for the free lists.
+- `collections.abc`: Standard library for the iterator type.
+- `contextlib`: Standard library for the borrow context manager.
+- `numpy`: Library for numerical operations.
+
+Classes:
+- `BufferPool`: A pool of reusable buffers with allocation statistics.
+
+Constants:
+- `POOL`: The pool of this process.
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class BufferPool:
+  """
+  A pool of reusable buffers, keyed by shape and dtype. Buffer contents are undefined when borrowed.
+
+  Attributes:
+      max_bytes (int): The maximum size of the idle buffers kept for reuse. 0 disables pooling.
+      requests (int): The number of buffers borrowed.
+      allocations (int): The number of buffers that had to be allocated (not reused).
+  """
+
+  def __init__(self, max_bytes: int) -> None:
+    self.max_bytes = max_bytes
+    self.requests = 0
+    self.allocations = 0
+    self._idle: dict[tuple[tuple[int, ...], np.dtype], list[np.ndarray]] = defaultdict(list)
+    self._idle_bytes = 0
+    self._lock = threading.Lock()
+
+  @contextmanager
+  def borrow(self) -> Iterator[Callable[..., np.ndarray]]:
+    """
+    Borrows buffers for the duration of a block. Every buffer taken in the block is given back when it exits, so
+    buffers must not be returned or kept beyond the block.
+
+    Yields:
+        Callable[..., np.ndarray]: `take(shape, dtype=np.uint8)`, which returns a buffer of that shape and dtype.
+    """
+    taken: list[np.ndarray] = []
+
+    def take(shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+      key = (tuple(shape), np.dtype(dtype))
+      with self._lock:
+        self.requests += 1
+        if self._idle[key]:
+          buffer = self._idle[key].pop()
+          self._idle_bytes -= buffer.nbytes
+        else:
+          self.allocations += 1
+          buffer = None
+      if buffer is None:
+        buffer = np.empty(key[0], dtype=key[1])
+      taken.append(buffer)
+      return buffer
+
+    try:
+      yield take
+    finally:
+      with self._lock:
+        for buffer in taken:
+          if self._idle_bytes + buffer.nbytes <= self.max_bytes:
+            self._idle[(buffer.shape, buffer.dtype)].append(buffer)
+            self._idle_bytes += buffer.nbytes
+
+  def clear(self) -> None:
+    """
+    Drops every idle buffer and resets the statistics.
+    """
+    with self._lock:
+      self._idle.clear()
+      self._idle_bytes = 0
+      self.requests = 0
+      self.allocations = 0
+
+
+POOL = BufferPool(max_bytes=512 * 1024 * 1024)
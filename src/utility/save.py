@@ -1,25 +1,40 @@
+import os
+import uuid
+
+import numpy as np
 from loguru import logger
 
 
-def vertices_as_txt(filename: str, vertices: list[list[float]]) -> None:
+def vertices_as_txt(filename: str, vertices: np.ndarray) -> None:
   """
-  Saves a list of vertex coordinates to a text file.
+  Saves vertex coordinates to a text file.
 
   Args:
       filename (str): The path to the file where the vertex coordinates will be saved.
-      vertices (list[list[float]]): A list of vertex coordinates, where each vertex is represented by a list of two floats [x, y].
+      vertices (np.ndarray): An (N, 2) array (or list) of vertex coordinates [x, y].
 
   Process:
-      1. Opens the specified file for writing.
-      2. Iterates over each vertex in the list.
-      3. Rounds the x and y coordinates to the nearest integer.
-      4. Writes the rounded coordinates to the file in the format [x, y].
-      5. Logs a message indicating the file has been saved.
+      1. Rounds the x and y coordinates to the nearest integer (halves to even, like `round`), all at once.
+      2. Writes the rounded coordinates to the file in the format [x, y], one vertex per line.
+      3. Logs a message indicating the file has been saved.
   """
+  rounded = np.rint(np.asarray(vertices, dtype=np.float64).reshape(-1, 2)).astype(np.int64)
   with open(filename, "w") as file:
-    for vertex in vertices:
-      x = round(vertex[0])
-      y = round(vertex[1])
-      coordinate = [x, y]
-      file.write(str(coordinate) + "\n")
+    np.savetxt(file, rounded, fmt="[%d, %d]")
   logger.info(f"Saved simplified/merged vertex coordinates in `{filename}`")
+
+
+def write_atomic(path: str, content: str) -> None:
+  """
+  Writes a small text file through a temporary file and a rename, so readers never see a partial file.
+
+  Args:
+      path (str): The destination path.
+      content (str): The text to write.
+  """
+  temporary: str = f"{path}.{uuid.uuid4().hex}.tmp"
+  with open(temporary, "w") as file:
+    file.write(content)
+    file.flush()
+    os.fsync(file.fileno())
+  os.replace(temporary, path)
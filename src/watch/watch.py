@@ -0,0 +1,199 @@
+"""
+This module provides a watch mode that reprocesses new or modified input images as they appear.
+
+The input directory is polled with `os.scandir`, which only stats the directory entries. A file is considered
+written once its size and modification time have stayed unchanged for `settle_seconds` (debounce of partial writes).
+Settled files are hashed together with the configuration; files whose hash matches the last successful run are
+skipped. The remaining files are processed on a bounded process pool.
+
+Dependencies:
+- `os`: Standard library for interacting with the operating system.
+- `json`: Standard library for JSON operations.
+- `hashlib`: Standard library for content hashing.
+- `threading`: Standard library for the stop event.
+- `time`: Standard library for time access.
+- `concurrent.futures`: Standard library for the worker pool.
+- `dataclasses.replace`: For deriving a per-image configuration.
+- `loguru.logger`: For logging information.
+- `src.config.config`: Custom module for configuration settings.
+- `src.config.location`: Custom module for input/output paths.
+- `src.pipeline.pipeline`: Custom module running the per-image pipeline.
+- `src.utility.save`: Custom module for atomic file writes.
+
+Functions:
+- `watch(config: Config, input_dir: str, output_dir: str, workers: int, poll_seconds: float, settle_seconds: float, stop: threading.Event | None = None) -> None`: Watches a directory until stopped.
+- `content_hash(path: str, config: Config) -> str`: Hashes an image together with the configuration.
+- `_process(config: Config, input_dir: str, output_dir: str, name: str) -> None`: Runs the pipeline for one image.
+- `_load_state(path: str) -> dict[str, str]`: Loads the hashes of the last successful runs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+
+from loguru import logger
+
+from src.config import location
+from src.config.config import VERSION, Config
+from src.pipeline import pipeline
+from src.utility import save
+
+# State of the watcher (inside the output directory)
+STATE = ".watch/state.json"
+
+
+def watch(
+  config: Config,
+  input_dir: str = "input",
+  output_dir: str = "output",
+  workers: int = 2,
+  poll_seconds: float = 1,
+  settle_seconds: float = 2,
+  stop: threading.Event | None = None,
+) -> None:
+  """
+  Watches a directory and reprocesses new or modified images until stopped (or interrupted with Ctrl+C).
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      input_dir (str, optional): The directory to watch. Defaults to "input".
+      output_dir (str, optional): The root directory of the outputs. Defaults to "output".
+      workers (int, optional): The maximum number of images processed at once. Defaults to 2.
+      poll_seconds (float, optional): Seconds between directory scans. Defaults to 1.
+      settle_seconds (float, optional): Seconds a file must stay unchanged before it is processed. Defaults to 2.
+      stop (threading.Event | None, optional): Event that ends the watch when set. Defaults to None.
+
+  Process:
+      1. Scans the directory and records the size and modification time of every image.
+      2. Restarts the debounce timer of files whose signature changed since the previous scan.
+      3. Hashes settled files and skips those matching the last successful run.
+      4. Submits the remaining files to the pool while fewer than `workers` images are in flight.
+      5. Records the hash of every successful run in `output/.watch/state.json`.
+  """
+  stop = stop or threading.Event()
+  state_path: str = os.path.join(output_dir, STATE)
+  os.makedirs(os.path.dirname(state_path), exist_ok=True)
+  state: dict[str, str] = _load_state(state_path)
+
+  handled: dict[str, tuple[int, int]] = {}  # Signature of the last version processed or skipped
+  settling: dict[str, tuple[tuple[int, int], float]] = {}  # Signature and time it was first seen
+  in_flight: dict[str, tuple[Future, str, tuple[int, int]]] = {}
+
+  logger.info(f"Watching `{input_dir}` for new or modified images")
+  with ProcessPoolExecutor(max_workers=workers) as pool:
+    try:
+      while not stop.is_set():
+        # Collect finished runs
+        for name, (future, digest, signature) in list(in_flight.items()):
+          if not future.done():
+            continue
+          del in_flight[name]
+          handled[name] = signature  # Failed versions are retried only once modified again
+          if future.exception() is not None:
+            logger.error(f"Failed to process `{name}`: {future.exception()!r}")
+            continue
+          state[name] = digest
+          save.write_atomic(state_path, json.dumps(state, indent=2))
+          logger.info(f"Reprocessed `{name}`")
+
+        # Scan for new or modified images
+        now: float = time.monotonic()
+        with os.scandir(input_dir) as entries:
+          images = [
+            entry for entry in entries if entry.is_file() and entry.name.lower().endswith(location.IMAGE_EXTENSIONS)
+          ]
+        rejected: set[str] = location.colliding(entry.name for entry in images)
+        for entry in images:
+          name: str = entry.name
+          try:
+            stat = entry.stat()
+          except OSError as error:  # Deleted or locked since the scan -> seen again on the next scan
+            logger.debug(f"Skipped `{name}` ({error})")
+            settling.pop(name, None)
+            continue
+          signature = (stat.st_size, stat.st_mtime_ns)
+          if handled.get(name) == signature or name in in_flight:
+            continue
+          if name in rejected:  # Outputs would overwrite each other -> warned once per version
+            handled[name] = signature
+            logger.warning(f"Skipped `{name}` (shares its output folder with another image, rename it)")
+            continue
+          if name not in settling or settling[name][0] != signature:
+            settling[name] = (signature, now)  # Still being written -> restart debounce
+            continue
+          if now - settling[name][1] < settle_seconds or len(in_flight) >= workers:
+            continue
+
+          del settling[name]
+          try:
+            digest: str = content_hash(entry.path, config)
+          except OSError as error:
+            logger.warning(f"Skipped `{name}`, it could not be read ({error})")
+            continue
+          if state.get(name) == digest:
+            handled[name] = signature
+            logger.debug(f"Skipped `{name}` (unchanged since last successful run)")
+            continue
+          in_flight[name] = (pool.submit(_process, config, input_dir, output_dir, name), digest, signature)
+          logger.info(f"Queued `{name}`")
+
+        stop.wait(poll_seconds)
+    except KeyboardInterrupt:
+      logger.info("Stopped watching")
+
+
+def content_hash(path: str, config: Config) -> str:
+  """
+  Hashes an image together with the configuration, so that configuration changes also trigger reprocessing.
+
+  Args:
+      path (str): The path to the image.
+      config (Config): An instance of the Config class containing configuration settings.
+
+  Returns:
+      str: The hexadecimal digest.
+  """
+  digest = hashlib.sha256(repr(replace(config, filename="")).encode())
+  with open(path, "rb") as file:
+    while chunk := file.read(1 << 20):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+def _process(config: Config, input_dir: str, output_dir: str, name: str) -> None:
+  """
+  Runs the pipeline for one image. Runs in a pool process.
+
+  Args:
+      config (Config): An instance of the Config class containing configuration settings.
+      input_dir (str): The directory containing the image.
+      output_dir (str): The root directory of the outputs.
+      name (str): The filename of the image.
+
+  Raises:
+      InputRejected: If the image is unusable (eg: blank image).
+  """
+  image_config: Config = replace(config, filename=name)
+  io = location.generate_io_paths(name, input_dir, output_dir)
+  location.generate_output_folder(name, output_dir)
+  pipeline.run(io, image_config, VERSION)
+
+
+def _load_state(path: str) -> dict[str, str]:
+  """
+  Loads the hashes of the last successful runs.
+
+  Args:
+      path (str): The path to the state file.
+
+  Returns:
+      dict[str, str]: A mapping of filenames to content hashes. Empty if no state was saved yet.
+  """
+  if not os.path.exists(path):
+    return {}
+  with open(path, "r") as file:
+    return json.load(file)